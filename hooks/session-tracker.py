@@ -19,45 +19,203 @@ Output:
 Text printed to stdout is added to Claude's context.
 """
 
+# Keep imports minimal: this runs as a fresh interpreter on every prompt,
+# so pathlib/typing (and their transitive imports) are deliberately avoided.
+from __future__ import annotations
+
 import json
 import os
+import stat
 import sys
-from pathlib import Path
+
+# Use orjson for parsing hook input when available, fall back to stdlib
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+
+GIT_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".vibe-check", "git-cache.json")
+GIT_CACHE_MAX_ENTRIES = 256
+_GIT_CACHE_KEYS = {"gitdir", "head", "head_mtime", "config", "config_mtime", "info"}
+
+
+def _mtime_ns(path: str) -> int | None:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _load_git_cache() -> dict:
+    try:
+        with open(GIT_CACHE_FILE) as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_git_cache(cache: dict) -> None:
+    """Atomically write the cache, evicting the oldest entries past the cap."""
+    while len(cache) > GIT_CACHE_MAX_ENTRIES:
+        cache.pop(next(iter(cache)))
+    try:
+        os.makedirs(os.path.dirname(GIT_CACHE_FILE), exist_ok=True)
+        tmp_path = f"{GIT_CACHE_FILE}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, GIT_CACHE_FILE)
+    except OSError:
+        pass
+
+
+def _find_gitdir(cwd: str) -> str | None:
+    """Walk up from cwd to the repository's git directory, if any.
+
+    Handles linked worktrees and submodules, where `.git` is a file
+    containing `gitdir: <path>`. Costs one stat() per directory level.
+    """
+    directory = os.path.abspath(cwd)
+    while True:
+        dot_git = os.path.join(directory, ".git")
+        try:
+            mode = os.stat(dot_git).st_mode
+        except OSError:
+            mode = 0
+        if stat.S_ISDIR(mode):
+            return dot_git
+        if stat.S_ISREG(mode):
+            try:
+                with open(dot_git) as f:
+                    content = f.read().strip()
+            except OSError:
+                return None
+            if content.startswith("gitdir:"):
+                return os.path.join(directory, content[len("gitdir:"):].strip())
+            return None
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+
+def _common_dir(gitdir: str) -> str:
+    """Return the directory holding shared files like config (worktree-aware)."""
+    try:
+        with open(os.path.join(gitdir, "commondir")) as f:
+            return os.path.join(gitdir, f.read().strip())
+    except OSError:
+        return gitdir
+
+
+def _read_branch(head_path: str) -> str | None:
+    """Read the current branch from HEAD, or the short sha when detached."""
+    with open(head_path) as f:
+        head = f.read().strip()
+    if head.startswith("ref:"):
+        ref = head[len("ref:"):].strip()
+        return ref[len("refs/heads/"):] if ref.startswith("refs/heads/") else ref
+    return head[:7] or None
+
+
+def _read_origin_url(config_path: str) -> str | None:
+    """Return remote.origin.url from a git config file.
+
+    A minimal line scanner: cheaper than configparser for one lookup, and
+    tolerant of git-specific syntax configparser rejects.
+    """
+    try:
+        with open(config_path) as f:
+            lines = f.readlines()
+    except OSError:
+        return None
+
+    in_origin = False
+    for line in lines:
+        line = line.strip()
+        if line.startswith("["):
+            header = line[1:line.find("]")].split(None, 1)
+            in_origin = (
+                len(header) == 2
+                and header[0].lower() == "remote"
+                and header[1].strip('"') == "origin"
+            )
+        elif in_origin and "=" in line:
+            key, value = line.split("=", 1)
+            if key.strip().lower() == "url":
+                return value.strip().strip('"') or None
+    return None
 
 
 def get_git_info(cwd: str) -> dict:
-    """Get git branch and repo name from the working directory."""
-    import subprocess
+    """Get git branch and repo name from the working directory.
+
+    Reads `.git/HEAD` and `.git/config` directly rather than shelling out
+    to git. Results are cached on disk per cwd and reused for as long as
+    those two files are unchanged, which also skips the parent-directory
+    walk on steady-state prompts. When the entry is stale (e.g. after a
+    branch switch) the cached git directory is reused. An explicit
+    `$GIT_DIR` short-circuits discovery and bypasses the cache.
+    """
+    env_gitdir = os.environ.get("GIT_DIR")
+    cache = {} if env_gitdir else _load_git_cache()
+    entry = cache.get(cwd)
+    # Truncated, hand-edited or older-format entries count as a miss
+    if not (
+        isinstance(entry, dict)
+        and _GIT_CACHE_KEYS <= entry.keys()
+        and all(isinstance(entry[key], str) for key in ("gitdir", "head", "config"))
+        and isinstance(entry["info"], dict)
+    ):
+        entry = None
+    if (
+        entry
+        and _mtime_ns(entry["head"]) == entry["head_mtime"]
+        and _mtime_ns(entry["config"]) == entry["config_mtime"]
+    ):
+        return entry["info"]
+
+    if env_gitdir:
+        gitdir = os.path.join(cwd, env_gitdir)
+    elif entry and os.path.isdir(entry["gitdir"]):
+        gitdir = entry["gitdir"]
+    else:
+        gitdir = _find_gitdir(cwd)
+
+    # Not inside a repository: the directory name is all there is to report
+    if not gitdir:
+        return {"repo": os.path.basename(os.path.normpath(cwd)), "branch": None}
 
     result = {"repo": None, "branch": None}
     try:
-        # Get current branch
-        branch = subprocess.run(
-            ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-            cwd=cwd,
-            capture_output=True,
-            text=True,
-            timeout=2,
-        )
-        if branch.returncode == 0:
-            result["branch"] = branch.stdout.strip()
-
-        # Get repo name from remote or directory
-        remote = subprocess.run(
-            ["git", "remote", "get-url", "origin"],
-            cwd=cwd,
-            capture_output=True,
-            text=True,
-            timeout=2,
-        )
-        if remote.returncode == 0:
-            url = remote.stdout.strip()
+        head_path = os.path.join(gitdir, "HEAD")
+        config_path = os.path.join(_common_dir(gitdir), "config")
+        try:
+            result["branch"] = _read_branch(head_path)
+        except (OSError, UnicodeDecodeError):
+            pass  # Unreadable HEAD: still report the repo name below
+        url = _read_origin_url(config_path)
+
+        if url:
             # Extract repo name from URL (handles both HTTPS and SSH)
             if "/" in url:
-                result["repo"] = url.split("/")[-1].replace(".git", "")
+                result["repo"] = url.rstrip("/").rsplit("/", 1)[-1].removesuffix(".git")
         else:
             # Fall back to directory name
-            result["repo"] = Path(cwd).name
+            result["repo"] = os.path.basename(os.path.normpath(cwd))
+
+        if not env_gitdir:
+            cache.pop(cwd, None)
+            cache[cwd] = {
+                "gitdir": gitdir,
+                "head": head_path,
+                "head_mtime": _mtime_ns(head_path),
+                "config": config_path,
+                "config_mtime": _mtime_ns(config_path),
+                "info": result,
+            }
+            _save_git_cache(cache)
 
     except Exception:
         pass
@@ -68,8 +226,8 @@ def get_git_info(cwd: str) -> dict:
 def main():
     # Read hook input from stdin
     try:
-        input_data = json.load(sys.stdin)
-    except json.JSONDecodeError:
+        input_data = json_loads(sys.stdin.buffer.read())
+    except ValueError:  # json.JSONDecodeError and orjson.JSONDecodeError
         sys.exit(0)  # Silent exit on invalid input
 
     session_id = input_data.get("session_id", "unknown")
@@ -87,10 +245,11 @@ def main():
 
     context = "[vibe-check] " + " | ".join(parts)
 
-    # Output context - this gets added to Claude's context automatically
-    print(context)
-
-    sys.exit(0)
+    # Output context - this gets added to Claude's context automatically.
+    # Write straight to fd 1 and skip interpreter teardown; nothing else
+    # is buffered at this point.
+    os.write(1, (context + "\n").encode("utf-8"))
+    os._exit(0)
 
 
 if __name__ == "__main__":
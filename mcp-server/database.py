@@ -1,39 +1,76 @@
 """
 Database connection handling for vibe-check MCP server.
 
-Uses read-only mode to avoid locks with the running monitor.
+Uses read-only mode to avoid locks with the running monitor. The monitor
+keeps the database in WAL journal mode, so these readers never block its
+writes and vice versa.
 """
 
+import atexit
 import sqlite3
+import threading
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, Iterator, List, Dict, Any
 import os
 
+# One connection per thread, opened lazily and kept for the process lifetime
+_tls = threading.local()
+_open_connections: List[sqlite3.Connection] = []
+
+# Compiled statements kept per connection. Tools build their SQL from a
+# handful of filter combinations, so this comfortably holds every variant.
+STATEMENT_CACHE_SIZE = 256
+
+# Locations to check, in priority order (after VIBE_CHECK_DB)
+_CANDIDATE_PATHS = tuple(
+    map(
+        os.path.expanduser,
+        (
+            "~/.vibe-check/vibe_check.db",
+            "/opt/homebrew/var/vibe-check/vibe_check.db",
+            "~/Developer/vibe-check/vibe_check.db",
+            "~/Developer/vibe-check/data/vibe_check.db",
+        ),
+    )
+)
+
+# Read-path PRAGMAs. mmap only reserves address space, so size it to cover
+# any realistic database and let reads come straight from the OS page cache.
+MMAP_SIZE = 1 << 30  # 1GB
+CACHE_SIZE_KIB = 20000  # ~20MB page cache
+
+# Resolved database location, memoized once found
+_db_path: Optional[Path] = None
+
+# Connection used only to read PRAGMA data_version, shared by all threads
+_version_conn: Optional[sqlite3.Connection] = None
+_version_lock = threading.Lock()
+
 
 def find_database_path() -> Optional[Path]:
     """
     Find the vibe-check database in standard locations.
 
-    Returns the first valid database path found, or None.
+    Returns the first valid database path found, or None. A found path
+    is memoized; a miss is not, so a database created after startup is
+    still picked up.
     """
+    global _db_path
+    if _db_path is not None:
+        return _db_path
+
     # Check VIBE_CHECK_DB environment variable first
     env_path = os.environ.get("VIBE_CHECK_DB")
     if env_path:
-        path = Path(env_path).expanduser()
-        if path.exists():
-            return path
-
-    # Locations to check, in priority order
-    locations = [
-        Path.home() / ".vibe-check" / "vibe_check.db",
-        Path("/opt/homebrew/var/vibe-check/vibe_check.db"),
-        Path.home() / "Developer" / "vibe-check" / "vibe_check.db",
-        Path.home() / "Developer" / "vibe-check" / "data" / "vibe_check.db",
-    ]
-
-    for path in locations:
-        if path.exists():
-            return path
+        env_path = os.path.expanduser(env_path)
+        if os.path.isfile(env_path):
+            _db_path = Path(env_path)
+            return _db_path
+
+    for path in _CANDIDATE_PATHS:
+        if os.path.isfile(path):
+            _db_path = Path(path)
+            return _db_path
 
     return None
 
@@ -42,11 +79,20 @@ def get_db_connection() -> sqlite3.Connection:
     """
     Get a read-only SQLite connection to the vibe-check database.
 
-    Uses file URI mode with ?mode=ro to prevent locks.
+    Uses file URI mode with ?mode=ro to prevent locks. The connection is
+    cached per thread and reused by subsequent queries.
 
     Raises:
         FileNotFoundError: If database cannot be found
     """
+    connection = getattr(_tls, "conn", None)
+    if connection is None:
+        connection = _tls.conn = _open_connection()
+    return connection
+
+
+def _open_connection(check_same_thread: bool = True) -> sqlite3.Connection:
+    """Open and tune a new read-only connection, tracked for atexit cleanup."""
     db_path = find_database_path()
 
     if not db_path:
@@ -60,33 +106,88 @@ def get_db_connection() -> sqlite3.Connection:
 
     # Use read-only URI mode to avoid database locks
     uri = f"file:{db_path}?mode=ro"
-    connection = sqlite3.connect(uri, uri=True)
+    # Autocommit: reads never sit inside a module-managed transaction, so a
+    # long-lived connection can't pin an old WAL snapshot between queries
+    connection = sqlite3.connect(
+        uri,
+        uri=True,
+        isolation_level=None,
+        cached_statements=STATEMENT_CACHE_SIZE,
+        check_same_thread=check_same_thread,
+    )
     connection.row_factory = sqlite3.Row  # Enable dict-like access
 
+    # Read tuning. locking_mode=EXCLUSIVE is deliberately not used: the
+    # monitor writes to this database concurrently and would be locked out.
+    connection.execute("PRAGMA query_only=ON")
+    # Readers can still hit SQLITE_BUSY briefly during WAL recovery/checkpoints
+    connection.execute("PRAGMA busy_timeout=5000")
+    connection.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+    connection.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KIB}")
+    # GROUP BY / DISTINCT / ORDER BY spill to temp b-trees; keep them in RAM
+    connection.execute("PRAGMA temp_store=MEMORY")
+
+    _open_connections.append(connection)
     return connection
 
 
-def execute_query(query: str, params: tuple = ()) -> List[Dict[str, Any]]:
+@atexit.register
+def _close_connections() -> None:
+    """Close all cached connections on interpreter shutdown."""
+    while _open_connections:
+        try:
+            _open_connections.pop().close()
+        except sqlite3.ProgrammingError:
+            pass  # Owned by another thread; the OS reclaims it at exit
+
+
+def execute_query(query: str, params: tuple = ()) -> List[sqlite3.Row]:
+    """
+    Execute a read-only query and return results as a list of rows.
+
+    Rows are sqlite3.Row objects, which support access by column name
+    and keys() without copying each row into a dict.
+    """
+    return get_db_connection().execute(query, params).fetchall()
+
+
+def iter_query(query: str, params: tuple = ()) -> Iterator[sqlite3.Row]:
+    """
+    Execute a read-only query and yield rows as SQLite steps to them.
+
+    For callers that consume rows once, in order, without needing the
+    whole result set in memory.
+    """
+    yield from get_db_connection().execute(query, params)
+
+
+def data_version() -> tuple:
+    """
+    Identify the current database state.
+
+    PRAGMA data_version changes whenever another connection (the monitor)
+    commits, including commits that so far only reached the WAL and so
+    leave the database file's mtime alone. The value is only comparable
+    on the same connection, so every thread reads it from one shared
+    connection, which is also part of the result.
+    """
+    global _version_conn
+    with _version_lock:
+        if _version_conn is None:
+            _version_conn = _open_connection(check_same_thread=False)
+        return id(_version_conn), _version_conn.execute("PRAGMA data_version").fetchone()[0]
+
+
+def execute_query_dicts(query: str, params: tuple = ()) -> List[Dict[str, Any]]:
     """
     Execute a read-only query and return results as list of dicts.
     """
-    conn = get_db_connection()
-    try:
-        cursor = conn.execute(query, params)
-        rows = cursor.fetchall()
-        return [dict(row) for row in rows]
-    finally:
-        conn.close()
+    return [dict(row) for row in execute_query(query, params)]
 
 
 def execute_scalar(query: str, params: tuple = ()) -> Any:
     """
     Execute a query and return single scalar value.
     """
-    conn = get_db_connection()
-    try:
-        cursor = conn.execute(query, params)
-        row = cursor.fetchone()
-        return row[0] if row else None
-    finally:
-        conn.close()
+    row = get_db_connection().execute(query, params).fetchone()
+    return row[0] if row else None
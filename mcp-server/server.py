@@ -18,15 +18,25 @@ Tools:
 """
 
 from mcp.server.fastmcp import FastMCP
+from collections import Counter, defaultdict
+import copy
+import functools
+from itertools import combinations
 from typing import Optional
 import json
-import webbrowser
-import urllib.request
-import urllib.error
+import re
+import sqlite3
 from pathlib import Path
 import os
 
-from database import execute_query, find_database_path
+from database import data_version, execute_query, find_database_path, iter_query
+
+# Use orjson for parsing when available, fall back to stdlib. Both accept
+# bytes, and orjson.JSONDecodeError subclasses json.JSONDecodeError.
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
 
 MCP_SERVER_VERSION = "1.2.4"
 
@@ -51,137 +61,398 @@ def _resume_command(session_id: Optional[str], cwd: Optional[str] = None) -> str
     return cmd
 
 
+# The CREATE statement of messages_fts, or None until it is found. Only a
+# miss is rechecked: the monitor creates the table once and keeps it.
+_fts_table_sql = None
+
+
+def _has_fts_table() -> bool:
+    """Check for the messages_fts table, querying sqlite_master until found."""
+    global _fts_table_sql
+    if _fts_table_sql is None:
+        rows = execute_query(
+            "SELECT sql FROM sqlite_master WHERE type='table' AND name='messages_fts'"
+        )
+        if rows:
+            _fts_table_sql = rows[0]["sql"] or ""
+    return _fts_table_sql is not None
+
+
+def _fts_uses_trigram() -> bool:
+    """Whether messages_fts was built with the trigram tokenizer.
+
+    The monitor falls back to unicode61 on SQLite older than 3.34.
+    """
+    return _has_fts_table() and "trigram" in _fts_table_sql.lower()
+
+
+def _forget_fts_table() -> None:
+    """Make the next _has_fts_table() call check sqlite_master again."""
+    global _fts_table_sql
+    _fts_table_sql = None
+
+
+def _preview_sql(column: str, length: int) -> str:
+    """SQL expression truncating a text column to length, with "..." if cut."""
+    return f"SUBSTR({column}, 1, {length}) || IIF(LENGTH({column}) > {length}, '...', '')"
+
+
+# Quoted phrases (left alone) or bare terms joined by . / : - such as
+# config.json, src/app.py or well-known, which FTS5 would reject or misparse
+_FTS_QUOTED_OR_COMPOUND = re.compile(r'("[^"]*")|(\w+(?:[./:-]+\w+)+)')
+
+
+def _sanitize_fts_query(query: str) -> str:
+    """Quote compound terms so FTS5 matches them literally."""
+    return _FTS_QUOTED_OR_COMPOUND.sub(
+        lambda m: m.group(1) or f'"{m.group(2)}"', query
+    )
+
+
+# One term of an FTS5 query: a quoted phrase, or a bare word up to
+# whitespace or parentheses
+_FTS_QUERY_TOKEN = re.compile(r'"[^"]*"|[^\s()"]+')
+_FTS_OPERATORS = frozenset(("AND", "OR", "NOT", "NEAR"))
+
+# The trigram tokenizer only indexes 3-character substrings, so a shorter
+# term matches nothing at all
+FTS_MIN_TERM_LENGTH = 3
+
+
+def _fts_query_terms(query: str) -> list:
+    """Split an FTS5 query into operators and terms (quotes and * removed)."""
+    tokens = []
+    for token in _FTS_QUERY_TOKEN.findall(query):
+        if token in _FTS_OPERATORS:
+            tokens.append(token)
+        elif token.startswith('"'):
+            tokens.append(token[1:-1])
+        else:
+            tokens.append(token.rstrip("*"))
+    return tokens
+
+
+def _has_short_fts_term(query: str) -> bool:
+    """Whether the query has a term too short for the trigram index."""
+    return any(
+        len(term) < FTS_MIN_TERM_LENGTH
+        for term in _fts_query_terms(query)
+        if term not in _FTS_OPERATORS
+    )
+
+
+def _like_query_sql(query: str, column: str) -> tuple:
+    """Translate an FTS5-style query into LIKE clauses on column.
+
+    Terms are ANDed, OR starts an alternative and NOT negates the next
+    term; NEAR and grouping are treated as plain AND.
+    """
+    groups = [[]]
+    params = []
+    negate = False
+    for term in _fts_query_terms(query):
+        if term == "OR":
+            groups.append([])
+        elif term == "NOT":
+            negate = True
+        elif term not in _FTS_OPERATORS and term:
+            groups[-1].append(f"{column} {'NOT ' if negate else ''}LIKE ?")
+            params.append(f"%{term}%")
+            negate = False
+    groups = [group for group in groups if group]
+    if not groups:
+        return f"{column} LIKE ?", [f"%{query}%"]
+    return "(" + " OR ".join(f"({' AND '.join(g)})" for g in groups) + ")", params
+
+
+def _repo_name_sql(column: str) -> str:
+    """SQL expression giving the repo name for a git remote URL column.
+
+    Matches url.split("/")[-1].replace(".git", "") in Python: RTRIM strips
+    the last path segment, whose length leaves just that segment.
+    """
+    return (
+        f"CASE WHEN IFNULL({column}, '') = '' THEN '(no repo)' "
+        f"ELSE REPLACE(SUBSTR({column}, "
+        f"LENGTH(RTRIM({column}, REPLACE({column}, '/', ''))) + 1), '.git', '') END"
+    )
+
+
+def _cache_until_db_changes(tool):
+    """Memoize a read-only tool's output while the database is unchanged.
+
+    Entries are keyed on data_version(), which moves whenever the monitor
+    commits, and on the UTC date, since the tools' date filters are
+    relative to SQLite's 'now'. "Error ..." results (e.g. a locked
+    database) are not cached, so the next call tries again.
+    """
+
+    class _Uncached(Exception):
+        pass
+
+    @functools.lru_cache(maxsize=32)
+    def cached(db_version, today, args, kwargs):
+        result = tool(*args, **dict(kwargs))
+        if result.startswith("Error"):
+            raise _Uncached(result)  # lru_cache doesn't store raised calls
+        return result
+
+    @functools.wraps(tool)
+    def wrapper(*args, **kwargs):
+        import time
+
+        try:
+            db_version = data_version()
+        except Exception:
+            return tool(*args, **kwargs)  # Let the tool report the problem
+        today = time.strftime("%Y-%m-%d", time.gmtime())
+        try:
+            return cached(db_version, today, args, tuple(sorted(kwargs.items())))
+        except _Uncached as e:
+            return e.args[0]
+
+    return wrapper
+
+
 # =============================================================================
 # TOOLS
 # =============================================================================
 
 
 @mcp.tool()
-def vibe_stats(days: Optional[int] = None, repo: Optional[str] = None) -> str:
+@_cache_until_db_changes
+def vibe_stats(
+    days: Optional[int] = None, repo: Optional[str] = None, format: str = "markdown"
+) -> str:
     """
     Query Claude Code usage statistics from the local database.
 
     Args:
         days: Limit to last N days (optional)
         repo: Filter to specific repository name (optional)
+        format: Output format - markdown or json (default: markdown)
     """
     where_clauses = []
+    rollup_clauses = []
     params = []
 
     if days:
         where_clauses.append("DATE(event_timestamp) >= DATE('now', ?)")
+        rollup_clauses.append("date >= DATE('now', ?)")
         params.append(f"-{days} days")
 
     if repo:
         where_clauses.append("git_remote_url LIKE ?")
+        rollup_clauses.append("git_remote_url LIKE ?")
         params.append(f"%{repo}%")
 
     where_sql = " AND ".join(where_clauses) if where_clauses else "1=1"
+    rollup_sql = " AND ".join(rollup_clauses) if rollup_clauses else "1=1"
 
-    try:
-        # Overview stats
-        overview = execute_query(
-            f"""
-            SELECT
-                COUNT(*) as total_events,
-                COUNT(DISTINCT event_session_id) as total_sessions,
-                COUNT(DISTINCT DATE(event_timestamp)) as days_active,
-                MIN(DATE(event_timestamp)) as first_use,
-                MAX(DATE(event_timestamp)) as last_use
-            FROM conversation_events
-            WHERE {where_sql}
-        """,
-            tuple(params),
-        )
-
-        stats = overview[0] if overview else {}
-
-        # Event type breakdown
-        event_types = execute_query(
-            f"""
-            SELECT
-                event_type,
-                COUNT(*) as count
-            FROM conversation_events
-            WHERE {where_sql}
-            GROUP BY event_type
-            ORDER BY count DESC
-        """,
-            tuple(params),
-        )
-
-        total = stats.get("total_events", 0)
-
-        # Top repositories
-        repos = execute_query(
-            f"""
-            SELECT
-                CASE
-                    WHEN git_remote_url IS NULL THEN '(no repo)'
-                    ELSE REPLACE(
-                        SUBSTR(git_remote_url, INSTR(git_remote_url, '/')+1),
-                        '.git', ''
-                    )
-                END as repository,
-                COUNT(DISTINCT event_session_id) as sessions,
-                COUNT(*) as events
-            FROM conversation_events
-            WHERE {where_sql}
-            GROUP BY git_remote_url
-            ORDER BY sessions DESC
-            LIMIT 10
-        """,
-            tuple(params),
-        )
+    # Only the rows each section displays: top 8 event types, top 5 repos
+    # and the last 7 days (the overview is a single row)
+    shown_sql = "rn <= CASE section_order WHEN 1 THEN 8 WHEN 2 THEN 5 ELSE 7 END"
 
-        # Daily activity (last 14 days)
-        daily = execute_query(
-            f"""
-            SELECT
-                DATE(event_timestamp) as date,
-                COUNT(*) as events,
-                COUNT(DISTINCT event_session_id) as sessions
-            FROM conversation_events
-            WHERE {where_sql}
-            GROUP BY DATE(event_timestamp)
-            ORDER BY date DESC
-            LIMIT 14
-        """,
-            tuple(params),
-        )
+    try:
+        # Read the monitor's daily rollup tables; databases written by an
+        # older monitor don't have them, so fall back to the event log
+        try:
+            rows = execute_query(
+                f"""
+                WITH stats AS (
+                    SELECT date, git_remote_url, event_type, events
+                    FROM daily_stats
+                    WHERE {rollup_sql}
+                ),
+                sess AS (
+                    SELECT date, git_remote_url, event_session_id
+                    FROM daily_sessions
+                    WHERE {rollup_sql}
+                )
+                SELECT section, label, events, sessions, days_active, first_use, last_use
+                FROM (
+                    SELECT
+                        0 as section_order,
+                        'overview' as section,
+                        NULL as label,
+                        COALESCE(SUM(events), 0) as events,
+                        (SELECT COUNT(DISTINCT event_session_id) FROM sess) as sessions,
+                        COUNT(DISTINCT NULLIF(date, '')) as days_active,
+                        MIN(NULLIF(date, '')) as first_use,
+                        MAX(NULLIF(date, '')) as last_use,
+                        1 as rn
+                    FROM stats
+                    UNION ALL
+                    SELECT
+                        1, 'event_type', NULLIF(event_type, ''), SUM(events),
+                        NULL, NULL, NULL, NULL,
+                        ROW_NUMBER() OVER (ORDER BY SUM(events) DESC, event_type)
+                    FROM stats
+                    GROUP BY event_type
+                    UNION ALL
+                    SELECT
+                        2, 'repo',
+                        CASE
+                            WHEN r.git_remote_url = '' THEN '(no repo)'
+                            ELSE REPLACE(
+                                SUBSTR(r.git_remote_url, INSTR(r.git_remote_url, '/')+1),
+                                '.git', ''
+                            )
+                        END,
+                        r.events, IFNULL(s.sessions, 0), NULL, NULL, NULL,
+                        ROW_NUMBER() OVER (
+                            ORDER BY IFNULL(s.sessions, 0) DESC, r.git_remote_url
+                        )
+                    FROM (
+                        SELECT git_remote_url, SUM(events) as events
+                        FROM stats GROUP BY git_remote_url
+                    ) r
+                    LEFT JOIN (
+                        SELECT git_remote_url, COUNT(DISTINCT event_session_id) as sessions
+                        FROM sess GROUP BY git_remote_url
+                    ) s ON s.git_remote_url = r.git_remote_url
+                    UNION ALL
+                    SELECT
+                        3, 'daily', NULLIF(d.date, ''), d.events, IFNULL(s.sessions, 0),
+                        NULL, NULL, NULL,
+                        ROW_NUMBER() OVER (ORDER BY NULLIF(d.date, '') DESC)
+                    FROM (
+                        SELECT date, SUM(events) as events FROM stats GROUP BY date
+                    ) d
+                    LEFT JOIN (
+                        SELECT date, COUNT(DISTINCT event_session_id) as sessions
+                        FROM sess GROUP BY date
+                    ) s ON s.date = d.date
+                )
+                WHERE {shown_sql}
+                ORDER BY section_order, rn
+            """,
+                tuple(params) * 2,
+            )
+        except sqlite3.OperationalError:
+            # One pass over the filtered events feeds every section; each
+            # section's rows are tagged and ranked so they can share one result
+            rows = execute_query(
+                f"""
+                WITH filtered AS (
+                    SELECT
+                        event_type,
+                        event_session_id,
+                        git_remote_url,
+                        DATE(event_timestamp) as day
+                    FROM conversation_events
+                    WHERE {where_sql}
+                )
+                SELECT section, label, events, sessions, days_active, first_use, last_use
+                FROM (
+                    SELECT
+                        0 as section_order,
+                        'overview' as section,
+                        NULL as label,
+                        COUNT(*) as events,
+                        COUNT(DISTINCT event_session_id) as sessions,
+                        COUNT(DISTINCT day) as days_active,
+                        MIN(day) as first_use,
+                        MAX(day) as last_use,
+                        1 as rn
+                    FROM filtered
+                    UNION ALL
+                    SELECT
+                        1, 'event_type', event_type, COUNT(*), NULL, NULL, NULL, NULL,
+                        ROW_NUMBER() OVER (ORDER BY COUNT(*) DESC, event_type)
+                    FROM filtered
+                    GROUP BY event_type
+                    UNION ALL
+                    SELECT
+                        2, 'repo',
+                        CASE
+                            WHEN git_remote_url IS NULL THEN '(no repo)'
+                            ELSE REPLACE(
+                                SUBSTR(git_remote_url, INSTR(git_remote_url, '/')+1),
+                                '.git', ''
+                            )
+                        END,
+                        COUNT(*), COUNT(DISTINCT event_session_id), NULL, NULL, NULL,
+                        ROW_NUMBER() OVER (
+                            ORDER BY COUNT(DISTINCT event_session_id) DESC, git_remote_url
+                        )
+                    FROM filtered
+                    GROUP BY git_remote_url
+                    UNION ALL
+                    SELECT
+                        3, 'daily', day, COUNT(*), COUNT(DISTINCT event_session_id),
+                        NULL, NULL, NULL,
+                        ROW_NUMBER() OVER (ORDER BY day DESC)
+                    FROM filtered
+                    GROUP BY day
+                )
+                WHERE {shown_sql}
+                ORDER BY section_order, rn
+            """,
+                tuple(params),
+            )
 
-        # Format output
-        output = "## Claude Code Usage Statistics\n\n"
-
-        output += "### Overview\n"
-        output += f"- Total events: {stats.get('total_events', 0):,}\n"
-        output += f"- Sessions: {stats.get('total_sessions', 0):,}\n"
-        output += f"- Days active: {stats.get('days_active', 0)}\n"
-        output += f"- First use: {stats.get('first_use', 'N/A')}\n"
-        output += f"- Last use: {stats.get('last_use', 'N/A')}\n\n"
-
-        output += "### Event Types\n"
-        for et in event_types[:8]:
-            pct = (et["count"] / total * 100) if total > 0 else 0
-            output += (
-                f"- {et['event_type'] or 'unknown'}: {et['count']:,} ({pct:.1f}%)\n"
+        sections = {"overview": [], "event_type": [], "repo": [], "daily": []}
+        for row in rows:
+            sections[row["section"]].append(row)
+        stats = sections["overview"][0]
+        total = stats["events"]
+
+        if format == "json":
+            return json.dumps(
+                {
+                    "overview": {
+                        "total_events": stats["events"],
+                        "sessions": stats["sessions"],
+                        "days_active": stats["days_active"],
+                        "first_use": stats["first_use"],
+                        "last_use": stats["last_use"],
+                    },
+                    "event_types": [
+                        {"event_type": et["label"], "events": et["events"]}
+                        for et in sections["event_type"]
+                    ],
+                    "repos": [
+                        {"repo": r["label"], "sessions": r["sessions"], "events": r["events"]}
+                        for r in sections["repo"]
+                    ],
+                    "daily": [
+                        {"date": d["label"], "events": d["events"], "sessions": d["sessions"]}
+                        for d in sections["daily"]
+                    ],
+                }
             )
-        output += "\n"
 
-        output += "### Top Repositories\n"
-        for r in repos[:5]:
-            output += (
-                f"- {r['repository']}: {r['sessions']} sessions, {r['events']} events\n"
+        # Format output
+        parts = ["## Claude Code Usage Statistics\n\n"]
+
+        parts.append("### Overview\n")
+        parts.append(f"- Total events: {stats['events']:,}\n")
+        parts.append(f"- Sessions: {stats['sessions']:,}\n")
+        parts.append(f"- Days active: {stats['days_active']}\n")
+        parts.append(f"- First use: {stats['first_use']}\n")
+        parts.append(f"- Last use: {stats['last_use']}\n\n")
+
+        parts.append("### Event Types\n")
+        for et in sections["event_type"]:
+            pct = (et["events"] / total * 100) if total > 0 else 0
+            parts.append(f"- {et['label'] or 'unknown'}: {et['events']:,} ({pct:.1f}%)\n")
+        parts.append("\n")
+
+        parts.append("### Top Repositories\n")
+        for r in sections["repo"]:
+            parts.append(
+                f"- {r['label']}: {r['sessions']} sessions, {r['events']} events\n"
             )
-        output += "\n"
+        parts.append("\n")
 
-        output += "### Recent Daily Activity\n"
-        for day in daily[:7]:
-            output += (
-                f"- {day['date']}: {day['events']} events, {day['sessions']} sessions\n"
+        parts.append("### Recent Daily Activity\n")
+        for day in sections["daily"]:
+            parts.append(
+                f"- {day['label']}: {day['events']} events, {day['sessions']} sessions\n"
             )
 
-        return output
+        return "".join(parts)
 
     except FileNotFoundError as e:
         return str(e)
@@ -190,22 +461,32 @@ def vibe_stats(days: Optional[int] = None, repo: Optional[str] = None) -> str:
 
 
 @mcp.tool()
+@_cache_until_db_changes
 def vibe_search(
     query: str,
     repo: Optional[str] = None,
     days: Optional[int] = None,
     session_id: Optional[str] = None,
     limit: int = 20,
+    format: str = "markdown",
 ) -> str:
     """
     Search through conversation history using full-text search.
 
+    With the trigram index (SQLite 3.34+), terms match anywhere inside
+    words, so identifier fragments, hyphenated terms and CJK text are found,
+    and queries with a term under 3 characters (e.g. "db") use plain
+    substring matching instead, without relevance ranking. Databases
+    indexed on older SQLite match whole words only. Phrase, prefix and
+    boolean syntax work either way.
+
     Args:
         query: Search term to find in messages (supports FTS5 syntax: AND, OR, NOT, "phrases", prefix*)
         repo: Filter to specific repository (optional)
         days: Limit to last N days (optional)
         session_id: Search within specific session (optional)
         limit: Maximum results (default: 20)
+        format: Output format - markdown or json (default: markdown)
 
     Examples:
         - Simple search: "authentication"
@@ -213,23 +494,24 @@ def vibe_search(
         - Phrase search: '"user authentication"'
         - Prefix matching: "auth*"
         - Boolean: "login NOT password"
+        - Substring: "UserName" (matches getUserName)
+        - Paths and names: "config.json", "src/app.py" (quoted automatically)
     """
     try:
         # Try FTS5 first, fall back to LIKE if FTS5 table doesn't exist
         try:
-            # Check if FTS5 table exists
-            fts_check = execute_query(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name='messages_fts'"
-            )
-            use_fts = len(fts_check) > 0
+            use_fts = _has_fts_table()
         except:
             use_fts = False
 
+        # The trigram index can't match short terms; substring-match instead
+        if use_fts and _fts_uses_trigram() and _has_short_fts_term(query):
+            use_fts = False
+
         if use_fts:
-            # Use FTS5 with relevance ranking
-            where_clauses = ["messages_fts MATCH ?"]
-            # FTS5 handles its own query syntax - don't wrap in %
-            params = [query]
+            # Use FTS5 with relevance ranking. FTS5 handles its own query
+            # syntax - don't wrap in %
+            params = []
 
             # Additional filters on the main table
             filter_clauses = []
@@ -245,30 +527,64 @@ def vibe_search(
                 filter_clauses.append("ce.event_session_id = ?")
                 params.append(session_id)
 
-            filter_sql = (" AND " + " AND ".join(filter_clauses)) if filter_clauses else ""
+            filter_sql = ("WHERE " + " AND ".join(filter_clauses)) if filter_clauses else ""
             params.append(limit)
 
-            try:
-                results = execute_query(
-                    f"""
-                    SELECT
-                        ce.event_session_id,
-                        ce.event_type,
-                        SUBSTR(ce.event_message, 1, 150) as message_preview,
-                        ce.event_timestamp,
-                        ce.git_remote_url,
-                        ce.file_name,
-                        json_extract(ce.event_data, '$.cwd') as cwd,
-                        fts.rank as relevance
-                    FROM messages_fts fts
-                    JOIN conversation_events ce ON ce.id = fts.rowid
+            # Rank inside the FTS index first and only look up the top hits
+            # in conversation_events. Filters may reject some of those, so
+            # overfetch, and if that still comes up short, rerun with the
+            # hit list uncapped. The cap keeps every hit tied with the last
+            # one kept, so equal ranks are still settled by the timestamp
+            # tiebreak below. The preview and cwd are built only for the
+            # rows that survive the final LIMIT.
+            hits_cap_sql = """
+                    WHERE rank <= IFNULL(
+                        (SELECT rank FROM matches ORDER BY rank LIMIT 1 OFFSET ?),
+                        rank
+                    )"""
+            fts_sql_template = f"""
+                WITH matches AS (
+                    SELECT rowid, rank
+                    FROM messages_fts
                     WHERE messages_fts MATCH ?
-                        {filter_sql}
-                    ORDER BY fts.rank, ce.event_timestamp DESC
+                ),
+                hits AS (
+                    SELECT rowid, rank
+                    FROM matches{{hits_cap}}
+                ),
+                top AS (
+                    SELECT ce.id, hits.rank, ce.event_timestamp
+                    FROM hits
+                    JOIN conversation_events ce ON ce.id = hits.rowid
+                    {filter_sql}
+                    ORDER BY hits.rank, ce.event_timestamp DESC
                     LIMIT ?
-                """,
-                    tuple(params),
                 )
+                SELECT
+                    ce.event_session_id,
+                    ce.event_type,
+                    {_preview_sql("ce.event_message", 150)} as message_preview,
+                    ce.event_timestamp,
+                    {_repo_name_sql("ce.git_remote_url")} as repo_name,
+                    ce.file_name,
+                    json_extract(ce.event_data, '$.cwd') as cwd,
+                    top.rank as relevance
+                FROM top
+                JOIN conversation_events ce ON ce.id = top.id
+                ORDER BY top.rank, top.event_timestamp DESC
+            """
+            hits_limit = limit * 4 if filter_clauses else limit
+
+            try:
+                match = _sanitize_fts_query(query)
+                results = execute_query(
+                    fts_sql_template.format(hits_cap=hits_cap_sql),
+                    (match, hits_limit - 1, *params),
+                )
+                if filter_clauses and len(results) < limit:
+                    results = execute_query(
+                        fts_sql_template.format(hits_cap=""), (match, *params)
+                    )
             except Exception as e:
                 # If FTS5 query fails (e.g., invalid syntax), provide helpful error
                 if "fts5" in str(e).lower() or "syntax error" in str(e).lower():
@@ -281,11 +597,14 @@ def vibe_search(
                         "- Exclude: login NOT password\n"
                         "- Prefix: auth*\n"
                     )
+                if "no such table" in str(e).lower():
+                    # Dropped while the monitor rebuilds it; check again next call
+                    _forget_fts_table()
                 raise
         else:
-            # Fall back to LIKE queries if FTS5 not available
-            where_clauses = ["event_message LIKE ?"]
-            params = [f"%{query}%"]
+            # Fall back to LIKE queries if FTS5 not available (or unusable)
+            like_sql, params = _like_query_sql(query, "event_message")
+            where_clauses = [like_sql]
 
             if repo:
                 where_clauses.append("git_remote_url LIKE ?")
@@ -307,9 +626,9 @@ def vibe_search(
                 SELECT
                     event_session_id,
                     event_type,
-                    SUBSTR(event_message, 1, 150) as message_preview,
+                    {_preview_sql("event_message", 150)} as message_preview,
                     event_timestamp,
-                    git_remote_url,
+                    {_repo_name_sql("git_remote_url")} as repo_name,
                     file_name,
                     json_extract(event_data, '$.cwd') as cwd
                 FROM conversation_events
@@ -321,43 +640,46 @@ def vibe_search(
                 tuple(params),
             )
 
+        if format == "json":
+            return json.dumps(
+                {
+                    "query": query,
+                    "ranked": use_fts,
+                    "results": [dict(r) for r in results],
+                }
+            )
+
         if not results:
             tips = "Try:\n- Broader search terms\n- Different date range\n- Checking if the monitor was running"
             if use_fts:
                 tips += '\n- Prefix matching: "auth*"\n- Phrase search: "user login"'
             return f"No results found for '{query}'.\n\n{tips}"
 
-        output = f"## Search Results for '{query}'\n\n"
-        output += f"Found {len(results)} matching messages"
+        parts = [f"## Search Results for '{query}'\n\n"]
+        parts.append(f"Found {len(results)} matching messages")
         if use_fts:
-            output += " (ranked by relevance)"
-        output += ":\n\n"
+            parts.append(" (ranked by relevance)")
+        parts.append(":\n\n")
 
         current_session = None
         for r in results:
             if r["event_session_id"] != current_session:
                 current_session = r["event_session_id"]
-                repo_name = (
-                    r["git_remote_url"].split("/")[-1].replace(".git", "")
-                    if r["git_remote_url"]
-                    else "(no repo)"
-                )
+                repo_name = r["repo_name"]
                 full_sid = r["event_session_id"] or "unknown"
                 cwd = r["cwd"]
-                output += f"\n### Session {full_sid} ({repo_name})\n"
+                parts.append(f"\n### Session {full_sid} ({repo_name})\n")
                 if cwd:
-                    output += f"- **cwd**: `{cwd}`\n"
+                    parts.append(f"- **cwd**: `{cwd}`\n")
                 if r["event_session_id"]:
-                    output += f"- **Resume**: `{_resume_command(full_sid, cwd)}`\n"
+                    parts.append(f"- **Resume**: `{_resume_command(full_sid, cwd)}`\n")
 
             msg_type = r["event_type"] or "unknown"
             preview = r["message_preview"] or ""
-            if len(preview) >= 150:
-                preview += "..."
 
             # Show relevance score for FTS5 results (more negative = more relevant)
             relevance_indicator = ""
-            if use_fts and "relevance" in r and r["relevance"] is not None:
+            if use_fts and r["relevance"] is not None:
                 # FTS5 rank is negative, convert to stars (more stars = more relevant)
                 rank_value = abs(r["relevance"])
                 if rank_value < 1.0:
@@ -367,10 +689,10 @@ def vibe_search(
                 elif rank_value < 10.0:
                     relevance_indicator = " ⭐"
 
-            output += f"- [{msg_type}]{relevance_indicator} {preview}\n"
-            output += f"  _{r['event_timestamp']}_\n"
+            parts.append(f"- [{msg_type}]{relevance_indicator} {preview}\n")
+            parts.append(f"  _{r['event_timestamp']}_\n")
 
-        return output
+        return "".join(parts)
 
     except FileNotFoundError as e:
         return str(e)
@@ -378,9 +700,17 @@ def vibe_search(
         return f"Error searching: {e}"
 
 
+# Text bars for 0-100% in 5% steps, indexed by int(pct / 5)
+_USAGE_BARS = tuple("#" * i + "." * (20 - i) for i in range(21))
+
+
 @mcp.tool()
+@_cache_until_db_changes
 def vibe_tools(
-    days: int = 30, repo: Optional[str] = None, show_combinations: bool = False
+    days: int = 30,
+    repo: Optional[str] = None,
+    show_combinations: bool = False,
+    format: str = "markdown",
 ) -> str:
     """
     Analyze Claude's tool usage patterns.
@@ -389,87 +719,119 @@ def vibe_tools(
         days: Number of days to analyze (default: 30)
         repo: Filter to specific repository (optional)
         show_combinations: Include tool combination analysis (default: False)
+        format: Output format - markdown or json (default: markdown)
     """
+    # days is bound rather than interpolated so the statement text (and its
+    # cached compiled form) is the same across calls
     where_clauses = [
         "event_type = 'assistant'",
-        f"DATE(event_timestamp) >= DATE('now', '-{days} days')",
+        "DATE(event_timestamp) >= DATE('now', ?)",
     ]
-    params = []
+    tool_uses_clauses = ["event_date >= DATE('now', ?)"]
+    params = [f"-{days} days"]
 
     if repo:
         where_clauses.append("git_remote_url LIKE ?")
+        tool_uses_clauses.append("git_remote_url LIKE ?")
         params.append(f"%{repo}%")
 
     where_sql = " AND ".join(where_clauses)
 
+    # (event_session_id, tool_name) per tool use. The monitor extracts these
+    # into tool_uses at insert time; databases from an older monitor don't
+    # have that table, so fall back to parsing event_data.
+    tool_source = f"""
+        SELECT event_session_id, tool_name
+        FROM tool_uses
+        WHERE {" AND ".join(tool_uses_clauses)}
+    """
+    fallback_source = f"""
+        SELECT event_session_id, json_extract(value, '$.name') as tool_name
+        FROM conversation_events,
+             json_each(json_extract(event_data, '$.message.content'))
+        WHERE {where_sql}
+            AND json_extract(value, '$.type') = 'tool_use'
+            AND json_extract(value, '$.name') IS NOT NULL
+    """
+    top_tools_sql = """
+        SELECT tool_name, COUNT(*) as usage_count
+        FROM ({source})
+        GROUP BY tool_name
+        ORDER BY usage_count DESC
+    """
+
     try:
         # Top tools
-        tools = execute_query(
-            f"""
-            SELECT
-                json_extract(value, '$.name') as tool_name,
-                COUNT(*) as usage_count
-            FROM conversation_events,
-                 json_each(json_extract(event_data, '$.message.content'))
-            WHERE {where_sql}
-                AND json_extract(value, '$.type') = 'tool_use'
-                AND json_extract(value, '$.name') IS NOT NULL
-            GROUP BY tool_name
-            ORDER BY usage_count DESC
-        """,
-            tuple(params),
-        )
+        try:
+            tools = execute_query(
+                top_tools_sql.format(source=tool_source), tuple(params)
+            )
+        except sqlite3.OperationalError:
+            tool_source = fallback_source
+            tools = execute_query(
+                top_tools_sql.format(source=tool_source), tuple(params)
+            )
 
-        output = f"## Tool Usage Analysis (Last {days} Days)\n\n"
+        total_uses = sum(t["usage_count"] for t in tools)
 
-        if not tools:
-            return output + "No tool usage data found for this period."
+        top_pairs = []
+        if tools and show_combinations:
+            # Tool combinations: fetch each session's distinct tools once and
+            # count pairs here, rather than self-joining every tool use
+            session_tools = execute_query(
+                f"""
+                SELECT DISTINCT event_session_id, tool_name
+                FROM ({tool_source})
+                WHERE event_session_id IS NOT NULL
+            """,
+                tuple(params),
+            )
 
-        total_uses = sum(t["usage_count"] for t in tools)
+            tools_by_session = defaultdict(set)
+            for row in session_tools:
+                tools_by_session[row["event_session_id"]].add(row["tool_name"])
+
+            pair_counts = Counter()
+            for session_tool_names in tools_by_session.values():
+                pair_counts.update(combinations(sorted(session_tool_names), 2))
+
+            top_pairs = sorted(pair_counts.items(), key=lambda kv: (-kv[1], kv[0]))[:10]
+
+        if format == "json":
+            result = {
+                "days": days,
+                "total_uses": total_uses,
+                "tools": [
+                    {"tool_name": t["tool_name"], "uses": t["usage_count"]} for t in tools
+                ],
+            }
+            if show_combinations:
+                result["combinations"] = [
+                    {"tools": list(pair), "sessions": sessions_together}
+                    for pair, sessions_together in top_pairs
+                ]
+            return json.dumps(result)
+
+        parts = [f"## Tool Usage Analysis (Last {days} Days)\n\n"]
+
+        if not tools:
+            return "".join(parts) + "No tool usage data found for this period."
 
-        output += "### Most Used Tools\n"
+        parts.append("### Most Used Tools\n")
         for t in tools[:10]:
             pct = t["usage_count"] / total_uses * 100
-            bar_len = int(pct / 5)
-            bar = "#" * bar_len + "." * (20 - bar_len)
-            output += (
+            bar = _USAGE_BARS[int(pct / 5)]
+            parts.append(
                 f"- **{t['tool_name']}**: {t['usage_count']:,} ({pct:.1f}%) [{bar}]\n"
             )
-        output += f"\n_Total tool uses: {total_uses:,}_\n\n"
+        parts.append(f"\n_Total tool uses: {total_uses:,}_\n\n")
 
         if show_combinations:
-            # Tool combinations
-            combos = execute_query(
-                f"""
-                WITH tool_sessions AS (
-                    SELECT
-                        event_session_id,
-                        json_extract(value, '$.name') as tool_name
-                    FROM conversation_events,
-                         json_each(json_extract(event_data, '$.message.content'))
-                    WHERE {where_sql}
-                        AND json_extract(value, '$.type') = 'tool_use'
-                        AND json_extract(value, '$.name') IS NOT NULL
-                )
-                SELECT
-                    a.tool_name as tool_1,
-                    b.tool_name as tool_2,
-                    COUNT(DISTINCT a.event_session_id) as sessions_together
-                FROM tool_sessions a
-                JOIN tool_sessions b ON a.event_session_id = b.event_session_id
-                WHERE a.tool_name < b.tool_name
-                GROUP BY a.tool_name, b.tool_name
-                ORDER BY sessions_together DESC
-                LIMIT 10
-            """,
-                tuple(params),
-            )
-
-            output += "### Common Tool Combinations\n"
-            for c in combos:
-                output += f"- {c['tool_1']} + {c['tool_2']}: {c['sessions_together']} sessions\n"
+            parts.append("### Common Tool Combinations\n")
+            for (tool_1, tool_2), sessions_together in top_pairs:
+                parts.append(f"- {tool_1} + {tool_2}: {sessions_together} sessions\n")
 
-        return output
+        return "".join(parts)
 
     except FileNotFoundError as e:
         return str(e)
@@ -478,23 +840,29 @@ def vibe_tools(
 
 
 @mcp.tool()
-def vibe_recent(period: str = "today", limit: int = 10) -> str:
+@_cache_until_db_changes
+def vibe_recent(period: str = "today", limit: int = 10, format: str = "markdown") -> str:
     """
     Get recent Claude Code sessions.
 
     Args:
         period: Time period - today, yesterday, week, or month (default: today)
         limit: Maximum sessions to show (default: 10)
+        format: Output format - markdown or json (default: markdown)
     """
-    date_filter = {
-        "today": "DATE(event_timestamp) = DATE('now')",
-        "yesterday": "DATE(event_timestamp) = DATE('now', '-1 day')",
-        "week": "DATE(event_timestamp) >= DATE('now', '-7 days')",
-        "month": "DATE(event_timestamp) >= DATE('now', '-30 days')",
-    }.get(period, "DATE(event_timestamp) = DATE('now')")
+    # (sql, param) pairs: the modifier is bound so each period shape
+    # reuses its cached statement
+    date_filter, date_param = {
+        "today": ("DATE(event_timestamp) = DATE('now', ?)", "+0 days"),
+        "yesterday": ("DATE(event_timestamp) = DATE('now', ?)", "-1 day"),
+        "week": ("DATE(event_timestamp) >= DATE('now', ?)", "-7 days"),
+        "month": ("DATE(event_timestamp) >= DATE('now', ?)", "-30 days"),
+    }.get(period, ("DATE(event_timestamp) = DATE('now', ?)", "+0 days"))
 
     try:
-        # Get sessions with summary
+        # Get sessions with summary. The first user message is looked up
+        # only for the sessions that survive the LIMIT, via the
+        # (event_session_id, ...) index, in the same statement.
         sessions = execute_query(
             f"""
             WITH session_summary AS (
@@ -502,7 +870,6 @@ def vibe_recent(period: str = "today", limit: int = 10) -> str:
                     event_session_id,
                     MIN(event_timestamp) as session_start,
                     MAX(event_timestamp) as session_end,
-                    COUNT(*) as event_count,
                     COUNT(CASE WHEN event_type = 'user' THEN 1 END) as user_messages,
                     COUNT(CASE WHEN event_type = 'assistant' THEN 1 END) as assistant_messages,
                     git_remote_url,
@@ -512,6 +879,12 @@ def vibe_recent(period: str = "today", limit: int = 10) -> str:
                 WHERE {date_filter}
                     AND event_session_id IS NOT NULL
                 GROUP BY event_session_id
+            ),
+            recent AS (
+                SELECT *
+                FROM session_summary
+                ORDER BY session_start DESC
+                LIMIT ?
             )
             SELECT
                 event_session_id,
@@ -520,73 +893,59 @@ def vibe_recent(period: str = "today", limit: int = 10) -> str:
                 ROUND((JULIANDAY(session_end) - JULIANDAY(session_start)) * 24 * 60, 1) as duration_minutes,
                 user_messages,
                 assistant_messages,
-                event_count,
-                git_remote_url,
+                {_repo_name_sql("git_remote_url")} as repo_name,
                 event_git_branch,
-                cwd
-            FROM session_summary
+                cwd,
+                (
+                    SELECT {_preview_sql("fm.event_message", 100)}
+                    FROM conversation_events fm
+                    WHERE fm.event_session_id = recent.event_session_id
+                        AND fm.event_type = 'user'
+                        AND fm.event_message IS NOT NULL
+                    ORDER BY fm.line_number ASC
+                    LIMIT 1
+                ) as first_msg
+            FROM recent
             ORDER BY session_start DESC
-            LIMIT ?
         """,
-            (limit,),
+            (date_param, limit),
         )
 
+        if format == "json":
+            return json.dumps(
+                {"period": period, "sessions": [dict(s) for s in sessions]}
+            )
+
         if not sessions:
             return f"No sessions found for {period}.\n\nThe monitor may not have been running during this period."
 
-        # Get first user message for each session
-        first_messages = {}
-        for s in sessions:
-            if s["event_session_id"]:
-                msg = execute_query(
-                    """
-                    SELECT SUBSTR(event_message, 1, 100) as first_msg
-                    FROM conversation_events
-                    WHERE event_session_id = ?
-                        AND event_type = 'user'
-                        AND event_message IS NOT NULL
-                    ORDER BY line_number ASC
-                    LIMIT 1
-                """,
-                    (s["event_session_id"],),
-                )
-                if msg:
-                    first_messages[s["event_session_id"]] = msg[0]["first_msg"]
-
-        output = f"## Recent Work ({period.title()})\n\n"
-        output += f"Found {len(sessions)} session(s):\n\n"
+        parts = [f"## Recent Work ({period.title()})\n\n"]
+        parts.append(f"Found {len(sessions)} session(s):\n\n")
 
         for s in sessions:
             full_sid = s["event_session_id"] or "unknown"
-            repo = (
-                s["git_remote_url"].split("/")[-1].replace(".git", "")
-                if s["git_remote_url"]
-                else "(no repo)"
-            )
+            repo = s["repo_name"]
             branch = s["event_git_branch"] or "unknown"
             duration = s["duration_minutes"] or 0
             cwd = s["cwd"]
 
-            output += f"### Session {full_sid}\n"
-            output += f"- **Repository**: {repo}\n"
-            output += f"- **Branch**: {branch}\n"
+            parts.append(f"### Session {full_sid}\n")
+            parts.append(f"- **Repository**: {repo}\n")
+            parts.append(f"- **Branch**: {branch}\n")
             if cwd:
-                output += f"- **cwd**: `{cwd}`\n"
-            output += f"- **Duration**: {duration:.0f} minutes\n"
-            output += f"- **Activity**: {s['user_messages']} user, {s['assistant_messages']} assistant messages\n"
-            output += f"- **Started**: {s['session_start']}\n"
+                parts.append(f"- **cwd**: `{cwd}`\n")
+            parts.append(f"- **Duration**: {duration:.0f} minutes\n")
+            parts.append(f"- **Activity**: {s['user_messages']} user, {s['assistant_messages']} assistant messages\n")
+            parts.append(f"- **Started**: {s['session_start']}\n")
             if s["event_session_id"]:
-                output += f"- **Resume**: `{_resume_command(full_sid, cwd)}`\n"
+                parts.append(f"- **Resume**: `{_resume_command(full_sid, cwd)}`\n")
 
-            if s["event_session_id"] in first_messages:
-                msg = first_messages[s["event_session_id"]]
-                if len(msg) >= 100:
-                    msg += "..."
-                output += f"- **First message**: _{msg}_\n"
+            if s["first_msg"] is not None:
+                parts.append(f"- **First message**: _{s['first_msg']}_\n")
 
-            output += "\n"
+            parts.append("\n")
 
-        return output
+        return "".join(parts)
 
     except FileNotFoundError as e:
         return str(e)
@@ -652,25 +1011,25 @@ def vibe_session(session_id: Optional[str] = None) -> str:
 
         s = results[0]
 
-        output = "## Session Information\n\n"
-        output += f"- **Session ID**: {s['event_session_id']}\n"
-        output += f"- **Log File**: {s['file_name']}\n"
-        output += f"- **Started**: {s['session_start']}\n"
-        output += f"- **Last Activity**: {s['session_end']}\n"
-        output += f"- **Total Events**: {s['total_events']}\n"
-        output += f"- **Messages**: {s['user_messages']} user, {s['assistant_messages']} assistant\n"
+        parts = ["## Session Information\n\n"]
+        parts.append(f"- **Session ID**: {s['event_session_id']}\n")
+        parts.append(f"- **Log File**: {s['file_name']}\n")
+        parts.append(f"- **Started**: {s['session_start']}\n")
+        parts.append(f"- **Last Activity**: {s['session_end']}\n")
+        parts.append(f"- **Total Events**: {s['total_events']}\n")
+        parts.append(f"- **Messages**: {s['user_messages']} user, {s['assistant_messages']} assistant\n")
 
         if s["git_remote_url"]:
             repo = s["git_remote_url"].split("/")[-1].replace(".git", "")
-            output += f"- **Repository**: {repo}\n"
+            parts.append(f"- **Repository**: {repo}\n")
         if s["event_git_branch"]:
-            output += f"- **Branch**: {s['event_git_branch']}\n"
+            parts.append(f"- **Branch**: {s['event_git_branch']}\n")
         if s["cwd"]:
-            output += f"- **cwd**: `{s['cwd']}`\n"
+            parts.append(f"- **cwd**: `{s['cwd']}`\n")
         if s["event_session_id"]:
-            output += f"- **Resume**: `{_resume_command(s['event_session_id'], s['cwd'])}`\n"
+            parts.append(f"- **Resume**: `{_resume_command(s['event_session_id'], s['cwd'])}`\n")
 
-        return output
+        return "".join(parts)
 
     except FileNotFoundError as e:
         return str(e)
@@ -681,23 +1040,41 @@ def vibe_session(session_id: Optional[str] = None) -> str:
 DEFAULT_API_URL = "https://vibecheck.wanderingstan.com/api"
 
 
-def _load_vibe_config() -> Optional[dict]:
-    """Load vibe-check config.json from standard locations."""
+@functools.lru_cache(maxsize=4)
+def _read_vibe_config(path: str, mtime_ns: int) -> Optional[dict]:
+    """Parse one config file; cached until its mtime changes."""
+    try:
+        with open(path, "rb") as f:
+            return json_loads(f.read())
+    except (json.JSONDecodeError, IOError):
+        return None
+
+
+def _vibe_config_candidates() -> list:
+    """Config file locations to check, in priority order."""
     config_path_env = os.environ.get("VIBE_CHECK_CONFIG")
-    candidates = (
-        [Path(config_path_env)] if config_path_env
-        else [
-            Path.home() / ".vibe-check" / "config.json",
-            Path("/opt/homebrew/var/vibe-check/config.json"),
-        ]
-    )
-    for path in candidates:
-        if path.exists():
-            try:
-                with open(path) as f:
-                    return json.load(f), path
-            except (json.JSONDecodeError, IOError):
-                continue
+    if config_path_env:
+        return [Path(config_path_env)]
+    return [
+        Path.home() / ".vibe-check" / "config.json",
+        Path("/opt/homebrew/var/vibe-check/config.json"),
+    ]
+
+
+def _load_vibe_config() -> tuple[Optional[dict], Optional[Path]]:
+    """Load vibe-check config.json from standard locations, with its path.
+
+    The parsed config is cached per file and shared between calls, so
+    callers must copy it before modifying it.
+    """
+    for path in _vibe_config_candidates():
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            continue
+        config = _read_vibe_config(str(path), mtime_ns)
+        if config is not None:
+            return config, path
     return None, None
 
 
@@ -774,6 +1151,33 @@ def _register_session_sync_scope(db_path: str, session_id: str) -> Optional[str]
         return str(e)
 
 
+def _open_url(url: str) -> None:
+    """Open url in the default browser without waiting for it to launch.
+
+    Spawns the platform opener detached; falls back to webbrowser.open
+    if that can't be started.
+    """
+    import subprocess
+    import sys
+
+    try:
+        if sys.platform == "win32":
+            os.startfile(url)
+            return
+        opener = "open" if sys.platform == "darwin" else "xdg-open"
+        subprocess.Popen(
+            [opener, url],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError:
+        import webbrowser
+
+        webbrowser.open(url)
+
+
 def _device_flow_auth(api_url: str) -> tuple[Optional[str], str]:
     """Perform device-flow authentication and return (api_key, error_message).
 
@@ -785,6 +1189,8 @@ def _device_flow_auth(api_url: str) -> tuple[Optional[str], str]:
         (None, error_message) on failure
     """
     import time as _time
+    import urllib.error
+    import urllib.request
 
     base_url = api_url.rstrip("/")
     if base_url.endswith("/api"):
@@ -803,7 +1209,7 @@ def _device_flow_auth(api_url: str) -> tuple[Optional[str], str]:
             method="POST",
         )
         with urllib.request.urlopen(req, timeout=10) as resp:
-            flow = json.loads(resp.read().decode("utf-8"))
+            flow = json_loads(resp.read())
     except Exception as e:
         return None, f"Failed to start authentication: {e}"
 
@@ -817,7 +1223,7 @@ def _device_flow_auth(api_url: str) -> tuple[Optional[str], str]:
 
     # Open browser — user just needs to click Approve
     try:
-        webbrowser.open(verification_url)
+        _open_url(verification_url)
     except Exception:
         pass  # Non-fatal if browser fails to open
 
@@ -838,7 +1244,7 @@ def _device_flow_auth(api_url: str) -> tuple[Optional[str], str]:
             )
             with urllib.request.urlopen(poll_req, timeout=10) as poll_resp:
                 status_code = poll_resp.status
-                poll_result = json.loads(poll_resp.read().decode("utf-8"))
+                poll_result = json_loads(poll_resp.read())
 
             if poll_result.get("status") == "approved":
                 api_key = poll_result.get("api_key")
@@ -883,6 +1289,8 @@ def vibe_share(
         wait_for_sync: If true, retry if session not synced yet (default: true)
     """
     import time
+    import urllib.error
+    import urllib.request
 
     # STEP 1: Load config
     config, config_path = _load_vibe_config()
@@ -918,6 +1326,7 @@ def vibe_share(
             return f"## Authentication Required\n\n{err}"
 
         api_key = new_api_key
+        config = copy.deepcopy(config)  # Don't modify the cached config
         # Save api_key to config (does NOT enable global sync — user chose selective sharing)
         if "api" not in config:
             config["api"] = {}
@@ -953,27 +1362,29 @@ def vibe_share(
         payload["slug"] = slug
 
     # Extended retry window: daemon polls every 5s, upload takes a few seconds.
-    # 8 retries × 5s = up to 40s waiting for sync before giving up.
-    max_retries = 8 if wait_for_sync else 1
-    retry_delay = 5  # seconds
+    # Back off from 0.5s so a quick sync is noticed quickly, capped at 8s:
+    # 9 attempts span ~40s of waiting for sync before giving up.
+    max_retries = 9 if wait_for_sync else 1
+    max_retry_delay = 8.0  # seconds
+
+    data = json.dumps(payload).encode("utf-8")
+    headers = {
+        "Content-Type": "application/json",
+        "Accept": "application/json",
+        "X-API-Key": api_key,
+        "User-Agent": "vibe-check-mcp/1.0",
+    }
 
+    req = urllib.request.Request(
+        share_endpoint, data=data, headers=headers, method="POST"
+    )
+    # One opener for every attempt: its handlers (proxies from the
+    # environment, proxy auth, redirects) are built once, not per retry
+    opener = urllib.request.build_opener()
     for attempt in range(max_retries):
         try:
-            data = json.dumps(payload).encode("utf-8")
-            req = urllib.request.Request(
-                share_endpoint,
-                data=data,
-                headers={
-                    "Content-Type": "application/json",
-                    "Accept": "application/json",
-                    "X-API-Key": api_key,
-                    "User-Agent": "vibe-check-mcp/1.0",
-                },
-                method="POST",
-            )
-
-            with urllib.request.urlopen(req, timeout=10) as response:
-                result = json.loads(response.read().decode("utf-8"))
+            with opener.open(req, timeout=10) as response:
+                result = json_loads(response.read())
 
             if result.get("status") == "ok" or result.get("share_url"):
                 base = api_url[:-4] if api_url.endswith("/api") else api_url
@@ -1010,14 +1421,14 @@ def vibe_share(
 
             if e.code == 403 and "do not own" in body and attempt < max_retries - 1:
                 # Session not yet synced — wait for daemon
-                time.sleep(retry_delay)
+                time.sleep(min(0.5 * 2**attempt, max_retry_delay))
                 continue
 
             return f"API error {e.code}: {body}"
 
         except urllib.error.URLError as e:
             if attempt < max_retries - 1:
-                time.sleep(retry_delay)
+                time.sleep(min(0.5 * 2**attempt, max_retry_delay))
                 continue
             return f"Network error: {e.reason}"
 
@@ -1034,21 +1445,7 @@ def vibe_share(
 @mcp.tool()
 def vibe_open_stats() -> str:
     """Open the web-based vibe-check stats page in the browser."""
-    # Find config file
-    config_paths = [
-        Path.home() / ".vibe-check" / "config.json",
-        Path("/opt/homebrew/var/vibe-check/config.json"),
-    ]
-
-    config = None
-    for path in config_paths:
-        if path.exists():
-            try:
-                with open(path) as f:
-                    config = json.load(f)
-                break
-            except (json.JSONDecodeError, IOError):
-                continue
+    config, _ = _load_vibe_config()
 
     if not config:
         return (
@@ -1075,12 +1472,32 @@ def vibe_open_stats() -> str:
     stats_url = f"{url}/stats.php?user={username}"
 
     try:
-        webbrowser.open(stats_url)
+        _open_url(stats_url)
         return f"Opened stats page in your browser:\n{stats_url}"
     except Exception as e:
         return f"Could not open browser. Visit manually:\n{stats_url}"
 
 
+# port -> monotonic deadline until which the web server is assumed up
+_web_server_seen_until: dict[int, float] = {}
+WEB_SERVER_PROBE_TTL = 2.0  # seconds
+
+
+def _web_server_running(port: int) -> bool:
+    """Probe the local web server, reusing a recent successful probe."""
+    import socket
+    import time
+
+    if time.monotonic() < _web_server_seen_until.get(port, 0.0):
+        return True
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.settimeout(0.1)
+        running = s.connect_ex(("127.0.0.1", port)) == 0
+    if running:
+        _web_server_seen_until[port] = time.monotonic() + WEB_SERVER_PROBE_TTL
+    return running
+
+
 @mcp.tool()
 def vibe_view(
     session_id: Optional[str] = None, message_uuid: Optional[str] = None
@@ -1095,16 +1512,9 @@ def vibe_view(
         session_id: Session ID to view (optional - opens session list if not provided)
         message_uuid: Specific message UUID to highlight and scroll to (optional)
     """
-    import socket
-
     port = int(os.environ.get("VIBE_CHECK_WEB_PORT", 8765))
 
-    # Check if server is running
-    def is_server_running():
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            return s.connect_ex(("127.0.0.1", port)) == 0
-
-    if not is_server_running():
+    if not _web_server_running(port):
         return (
             f"Local web server is not running on port {port}.\n\n"
             "Start it with:\n"
@@ -1126,7 +1536,7 @@ def vibe_view(
         url = f"http://localhost:{port}/"
 
     try:
-        webbrowser.open(url)
+        _open_url(url)
         if session_id:
             if message_uuid:
                 return f"Opened session {session_id[:8]}... at message {message_uuid[:8]}... in browser:\n{url}"
@@ -1136,6 +1546,72 @@ def vibe_view(
         return f"Could not open browser. Visit manually:\n{url}"
 
 
+# Problems vibe_doctor recognizes in `vibe-check status` output
+_STATUS_ISSUE_RE = re.compile(
+    r"(?P<not_running>❌ Not running)"
+    r"|(?P<mcp>MCP: (?:   )?❌)"
+    r"|(?P<skills>Skills: ⚠️)"
+    r"|(?P<no_db>not created yet)"
+)
+_STATUS_ISSUES = {
+    "not_running": ("Service is not running", "Start it with: `vibe-check start`"),
+    "mcp": (
+        "MCP plugin not installed",
+        "Install MCP and skills with: `./scripts/install-plugin.sh`",
+    ),
+    "skills": (
+        "Some skills are missing",
+        "Install missing skills with: `./scripts/install-plugin.sh`",
+    ),
+    "no_db": (
+        "Database not yet created",
+        "Start the service and use Claude Code to generate some conversations",
+    ),
+}
+
+
+_DOCTOR_HELP_FOOTER = (
+    "### Need More Help?\n\n"
+    "- View logs: `vibe-check logs`\n"
+    "- Check authentication: `vibe-check auth status`\n"
+    "- Restart service: `vibe-check restart`\n"
+    "- Documentation: `/Users/wanderingstan/Developer/vibe-check/CLAUDE.md`\n"
+)
+_VIBE_CHECK_NOT_FOUND = (
+    "## vibe-check Not Found\n\n"
+    "The `vibe-check` command is not available.\n\n"
+    "**Installation**:\n"
+    "```bash\n"
+    "# Via Homebrew:\n"
+    "brew tap wanderingstan/vibe-check\n"
+    "brew install vibe-check\n\n"
+    "# Or via git:\n"
+    "git clone https://github.com/wanderingstan/vibe-check.git\n"
+    "cd vibe-check\n"
+    "./scripts/install.sh\n"
+    "```"
+)
+_VIBE_CHECK_STATUS_TIMEOUT = (
+    "## Timeout\n\n"
+    "The `vibe-check status` command timed out. The service may be unresponsive."
+)
+
+
+# Resolved path of the vibe-check CLI. Only a hit is cached, so installing
+# it while the server is running is picked up on the next call.
+_vibe_check_bin: Optional[str] = None
+
+
+def _find_vibe_check_bin() -> Optional[str]:
+    """Locate the vibe-check CLI on PATH without spawning a process."""
+    global _vibe_check_bin
+    if _vibe_check_bin is None:
+        import shutil
+
+        _vibe_check_bin = shutil.which("vibe-check")
+    return _vibe_check_bin
+
+
 @mcp.tool()
 def vibe_doctor() -> str:
     """
@@ -1144,12 +1620,18 @@ def vibe_doctor() -> str:
     Runs diagnostic checks and provides guidance on fixing issues.
     Use when user asks about vibe-check configuration or reports problems.
     """
+    global _vibe_check_bin
     import subprocess
 
     try:
+        vibe_check_bin = _find_vibe_check_bin()
+        if vibe_check_bin is None:
+            # Report it as not installed without a doomed fork/exec
+            raise FileNotFoundError("vibe-check")
+
         # Run vibe-check status
         result = subprocess.run(
-            ["vibe-check", "status"],
+            [vibe_check_bin, "status"],
             capture_output=True,
             text=True,
             timeout=10,
@@ -1157,130 +1639,175 @@ def vibe_doctor() -> str:
 
         status_output = result.stdout if result.returncode == 0 else result.stderr
 
-        # Get config path
-        config_paths = [
-            Path.home() / ".vibe-check" / "config.json",
-            Path("/opt/homebrew/var/vibe-check/config.json"),
-        ]
-
+        # Get config path. Unlike _load_vibe_config, an unparseable file
+        # is still reported by location.
         config_path = None
         config = None
-        for path in config_paths:
-            if path.exists():
-                config_path = path
-                try:
-                    with open(path) as f:
-                        config = json.load(f)
-                    break
-                except (json.JSONDecodeError, IOError):
-                    continue
+        for path in _vibe_config_candidates():
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+            config_path = path
+            config = _read_vibe_config(str(path), mtime_ns)
+            if config is not None:
+                break
 
-        output = "## Vibe-Check Diagnostic Report\n\n"
+        parts = ["## Vibe-Check Diagnostic Report\n\n"]
 
         # Status section
-        output += "### Current Status\n```\n"
-        output += status_output
-        output += "\n```\n\n"
+        parts.append("### Current Status\n```\n")
+        parts.append(status_output)
+        parts.append("\n```\n\n")
 
         # Config section
         if config_path:
-            output += f"### Configuration\n"
-            output += f"**Location**: `{config_path}`\n\n"
+            parts.append(f"### Configuration\n")
+            parts.append(f"**Location**: `{config_path}`\n\n")
 
             if config:
-                output += "**Key Settings**:\n"
+                parts.append("**Key Settings**:\n")
                 monitor_dir = config.get("monitor", {}).get(
                     "conversation_dir", "Not set"
                 )
-                output += f"- Conversation directory: `{monitor_dir}`\n"
+                parts.append(f"- Conversation directory: `{monitor_dir}`\n")
 
                 sqlite_enabled = config.get("sqlite", {}).get("enabled", False)
-                output += f"- SQLite enabled: {sqlite_enabled}\n"
+                parts.append(f"- SQLite enabled: {sqlite_enabled}\n")
 
                 if sqlite_enabled:
                     db_path = config.get("sqlite", {}).get("database_path", "Not set")
-                    output += f"- Database path: `{db_path}`\n"
+                    parts.append(f"- Database path: `{db_path}`\n")
 
                 api_enabled = config.get("api", {}).get("enabled", False)
-                output += f"- Remote sync enabled: {api_enabled}\n\n"
+                parts.append(f"- Remote sync enabled: {api_enabled}\n\n")
         else:
-            output += "### Configuration\n"
-            output += (
+            parts.append("### Configuration\n")
+            parts.append(
                 "⚠️  Config file not found. Expected at `~/.vibe-check/config.json`\n\n"
             )
 
         # Recommendations section
-        output += "### Recommendations\n\n"
+        parts.append("### Recommendations\n\n")
 
-        # Parse status output for issues
+        # Parse status output for issues in one pass, reported in a fixed order
+        found = {m.lastgroup for m in _STATUS_ISSUE_RE.finditer(status_output)}
         issues = []
         recommendations = []
-
-        if "❌ Not running" in status_output:
-            issues.append("Service is not running")
-            recommendations.append("Start it with: `vibe-check start`")
-
-        if "MCP:    ❌" in status_output or "MCP: ❌" in status_output:
-            issues.append("MCP plugin not installed")
-            recommendations.append(
-                "Install MCP and skills with: `./scripts/install-plugin.sh`"
-            )
-
-        if "Skills: ⚠️" in status_output:
-            issues.append("Some skills are missing")
-            recommendations.append(
-                "Install missing skills with: `./scripts/install-plugin.sh`"
-            )
-
-        if "not created yet" in status_output:
-            issues.append("Database not yet created")
-            recommendations.append(
-                "Start the service and use Claude Code to generate some conversations"
-            )
+        for key, (issue, recommendation) in _STATUS_ISSUES.items():
+            if key in found:
+                issues.append(issue)
+                recommendations.append(recommendation)
 
         if issues:
-            output += "**Issues Found**:\n"
+            parts.append("**Issues Found**:\n")
             for i, issue in enumerate(issues, 1):
-                output += f"{i}. {issue}\n"
-            output += "\n**Next Steps**:\n"
+                parts.append(f"{i}. {issue}\n")
+            parts.append("\n**Next Steps**:\n")
             for i, rec in enumerate(recommendations, 1):
-                output += f"{i}. {rec}\n"
-            output += "\n"
+                parts.append(f"{i}. {rec}\n")
+            parts.append("\n")
         else:
-            output += "✅ Everything looks good! Vibe-check appears to be configured and running correctly.\n\n"
+            parts.append("✅ Everything looks good! Vibe-check appears to be configured and running correctly.\n\n")
 
         # Additional help
-        output += "### Need More Help?\n\n"
-        output += "- View logs: `vibe-check logs`\n"
-        output += "- Check authentication: `vibe-check auth status`\n"
-        output += "- Restart service: `vibe-check restart`\n"
-        output += (
-            "- Documentation: `/Users/wanderingstan/Developer/vibe-check/CLAUDE.md`\n"
-        )
+        parts.append(_DOCTOR_HELP_FOOTER)
 
-        return output
+        return "".join(parts)
 
     except FileNotFoundError:
-        return (
-            "## vibe-check Not Found\n\n"
-            "The `vibe-check` command is not available.\n\n"
-            "**Installation**:\n"
-            "```bash\n"
-            "# Via Homebrew:\n"
-            "brew tap wanderingstan/vibe-check\n"
-            "brew install vibe-check\n\n"
-            "# Or via git:\n"
-            "git clone https://github.com/wanderingstan/vibe-check.git\n"
-            "cd vibe-check\n"
-            "./scripts/install.sh\n"
-            "```"
-        )
+        _vibe_check_bin = None  # Uninstalled since it was found
+        return _VIBE_CHECK_NOT_FOUND
     except subprocess.TimeoutExpired:
-        return "## Timeout\n\nThe `vibe-check status` command timed out. The service may be unresponsive."
+        return _VIBE_CHECK_STATUS_TIMEOUT
     except Exception as e:
         return f"## Error\n\nFailed to run diagnostics: {e}"
 
 
+_SQL_SELECT_ONLY = (
+    "⚠️  Only SELECT and WITH queries are supported.\n\n"
+    "The database is opened in read-only mode, so INSERT/UPDATE/DELETE "
+    "will fail anyway, but it's best to use SELECT queries only."
+)
+_SQL_SCHEMA_TIP = "\n\n**Tip:** Check the database schema at ~/.vibe-check/SCHEMA.md"
+
+# Monotonic deadline until which SCHEMA.md is assumed to exist
+_schema_doc_seen_until = 0.0
+SCHEMA_DOC_PROBE_TTL = 60.0  # seconds
+
+
+def _schema_doc_exists() -> bool:
+    """Check for ~/.vibe-check/SCHEMA.md, reusing a recent hit."""
+    global _schema_doc_seen_until
+    import time
+
+    if time.monotonic() < _schema_doc_seen_until:
+        return True
+    exists = (Path.home() / ".vibe-check" / "SCHEMA.md").exists()
+    if exists:
+        _schema_doc_seen_until = time.monotonic() + SCHEMA_DOC_PROBE_TTL
+    return exists
+
+
+SQL_CELL_MAX_CHARS = 50  # Longer values are cut to fit, ending in "..."
+
+# Keep cell text from breaking the markdown table: escape column
+# separators and fold line breaks onto one line
+_SQL_CELL_ESCAPES = str.maketrans({"|": "\\|", "\n": " ", "\r": ""})
+
+
+@functools.lru_cache(maxsize=128)
+def _sql_table_header(columns: tuple) -> str:
+    """Markdown header and separator rows for a vibe_sql result shape."""
+    return (
+        "| " + " | ".join(c.translate(_SQL_CELL_ESCAPES) for c in columns) + " |\n"
+        "| " + " | ".join(["---"] * len(columns)) + " |\n"
+    )
+
+
+def _format_sql_cell(val) -> str:
+    """Format one vibe_sql result value for the markdown table."""
+    # Text is the common case and needs no str() copy
+    if isinstance(val, str):
+        val_str = val
+    elif val is None:
+        return "NULL"
+    elif isinstance(val, (int, float)):
+        return str(val)
+    else:
+        val_str = str(val)
+    # Truncate long strings
+    if len(val_str) > SQL_CELL_MAX_CHARS:
+        val_str = val_str[: SQL_CELL_MAX_CHARS - 3] + "..."
+    return val_str.translate(_SQL_CELL_ESCAPES)
+
+
+def _strip_sql_trailer(query: str) -> str:
+    """Drop trailing semicolons, comments and whitespace from a statement.
+
+    Quoted strings and identifiers are skipped whole, so a ; or -- inside
+    them is kept.
+    """
+    end = 0
+    i, n = 0, len(query)
+    while i < n:
+        c = query[i]
+        if c in "'\"`[":
+            close = query.find("]" if c == "[" else c, i + 1)
+            i = end = n if close < 0 else close + 1
+        elif query.startswith("--", i):
+            newline = query.find("\n", i)
+            i = n if newline < 0 else newline + 1
+        elif query.startswith("/*", i):
+            close = query.find("*/", i + 2)
+            i = n if close < 0 else close + 2
+        else:
+            if not c.isspace() and c != ";":
+                end = i + 1
+            i += 1
+    return query[:end]
+
+
 @mcp.tool()
 def vibe_sql(query: str, limit: int = 100) -> str:
     """
@@ -1293,73 +1820,53 @@ def vibe_sql(query: str, limit: int = 100) -> str:
         query: SQL query to execute (SELECT only)
         limit: Maximum rows to return (default: 100, max: 1000)
     """
-    # Safety checks
-    query_upper = query.strip().upper()
+    # Safety checks. Only the leading keyword matters, so upper-case just
+    # enough of the query to see it.
+    keyword = query.lstrip()[:6].upper()
 
     # Warn about non-SELECT queries (though read-only mode prevents writes)
-    if not query_upper.startswith("SELECT") and not query_upper.startswith("WITH"):
-        return (
-            "⚠️  Only SELECT and WITH queries are supported.\n\n"
-            "The database is opened in read-only mode, so INSERT/UPDATE/DELETE "
-            "will fail anyway, but it's best to use SELECT queries only."
-        )
+    if not keyword.startswith(("SELECT", "WITH")):
+        return _SQL_SELECT_ONLY
 
     # Cap limit
     if limit > 1000:
         limit = 1000
 
-    # Add LIMIT if not present
-    if "LIMIT" not in query_upper:
-        query = f"{query.rstrip(';')} LIMIT {limit}"
+    # Always bound the query in SQL. Wrapping (rather than appending LIMIT
+    # when none is present) also caps a larger LIMIT inside the query and
+    # isn't fooled by identifiers like limit_price. Trailing comments go
+    # before the trailing ; so "SELECT 1; -- done" still wraps cleanly.
+    query = f"SELECT * FROM (\n{_strip_sql_trailer(query)}\n) LIMIT ?"
 
     try:
-        results = execute_query(query)
-
-        if not results:
+        # Format rows into a markdown table as they are stepped, rather
+        # than materializing the result set first. The title goes in
+        # parts[0] once the row count is known.
+        parts = [""]
+        row_count = 0
+        for row in iter_query(query, (limit,)):
+            if not row_count:
+                parts.append(_sql_table_header(tuple(row.keys())))
+            # Row iterates its values in column order
+            parts.append("| " + " | ".join(map(_format_sql_cell, row)) + " |\n")
+            row_count += 1
+
+        if not row_count:
             return "Query executed successfully but returned no rows."
 
-        # Format results as markdown table
-        output = f"## Query Results ({len(results)} rows)\n\n"
-
-        # Get column names
-        columns = list(results[0].keys())
-
-        # Build table header
-        output += "| " + " | ".join(columns) + " |\n"
-        output += "| " + " | ".join(["---"] * len(columns)) + " |\n"
-
-        # Build table rows
-        for row in results:
-            values = []
-            for col in columns:
-                val = row[col]
-                # Format value
-                if val is None:
-                    val_str = "NULL"
-                elif isinstance(val, (int, float)):
-                    val_str = str(val)
-                else:
-                    # Truncate long strings
-                    val_str = str(val)
-                    if len(val_str) > 50:
-                        val_str = val_str[:47] + "..."
-                values.append(val_str)
-            output += "| " + " | ".join(values) + " |\n"
+        parts[0] = f"## Query Results ({row_count} rows)\n\n"
 
         # Show if results were limited
-        if len(results) == limit:
-            output += f"\n_Results limited to {limit} rows. Use smaller LIMIT in query for different amount._\n"
+        if row_count == limit:
+            parts.append(f"\n_Results limited to {limit} rows. Use smaller LIMIT in query for different amount._\n")
 
-        return output
+        return "".join(parts)
 
     except FileNotFoundError as e:
         return str(e)
     except Exception as e:
         # Include schema reference in error message to help debugging
-        schema_file = Path.home() / ".vibe-check" / "SCHEMA.md"
-        schema_note = ""
-        if schema_file.exists():
-            schema_note = "\n\n**Tip:** Check the database schema at ~/.vibe-check/SCHEMA.md"
+        schema_note = _SQL_SCHEMA_TIP if _schema_doc_exists() else ""
         return f"## SQL Error\n\n```\n{e}\n```\n\nCheck your query syntax and try again.{schema_note}"
 
 
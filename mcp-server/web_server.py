@@ -17,24 +17,58 @@ Environment:
     VIBE_CHECK_WEB_PORT         Port to serve on (default: 8765)
 """
 
+import functools
+import gzip
 import os
 import re
 import html
 import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from http.server import HTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
 from datetime import datetime
 
-from database import execute_query, find_database_path
+from database import data_version, execute_query, find_database_path
 
 DEFAULT_PORT = 8765
 
-# Try to import markdown for rich rendering, fall back to plain text
+# Requests are served concurrently by a fixed pool of threads, each keeping
+# its own database connection (see database.get_db_connection)
+REQUEST_WORKERS = 8
+
+# Try to import a markdown renderer for rich rendering, fall back to plain
+# text. cmarkgfm (C bindings to GitHub's cmark) is much faster on long
+# messages than the pure-Python markdown package, so prefer it.
 try:
-    import markdown
-    HAS_MARKDOWN = True
+    import cmarkgfm
+    from cmarkgfm.cmark import Options as CmarkOptions
+    HAS_CMARKGFM = True
 except ImportError:
-    HAS_MARKDOWN = False
+    HAS_CMARKGFM = False
+
+HAS_MARKDOWN = False
+if not HAS_CMARKGFM:
+    try:
+        import markdown
+        HAS_MARKDOWN = True
+    except ImportError:
+        pass
+
+# One converter per request thread: building a Markdown instance loads and
+# configures its extensions, so do it once and reset() between messages.
+# Instances keep parse state, so threads can't share one.
+_markdown_tls = threading.local()
+
+
+def get_markdown_converter():
+    """Return this thread's Markdown converter, creating it on first use."""
+    converter = getattr(_markdown_tls, 'converter', None)
+    if converter is None:
+        converter = _markdown_tls.converter = markdown.Markdown(
+            extensions=['fenced_code', 'tables', 'nl2br']
+        )
+    return converter
 
 
 # =============================================================================
@@ -206,6 +240,15 @@ def html_page(title: str, content: str, include_highlight: bool = False) -> str:
 </html>"""
 
 
+class ErrorPage(str):
+    """A rendered error or not-found page. These are never cached."""
+
+
+def error_page(title: str, message: str) -> ErrorPage:
+    """Wrap an (already escaped) message in a page marked as an error."""
+    return ErrorPage(html_page(title, f'<div class="empty-state">{message}</div>'))
+
+
 # =============================================================================
 # MESSAGE PARSING
 # =============================================================================
@@ -246,13 +289,33 @@ def parse_message_segments(message: str) -> list:
     return segments if segments else [{'type': 'text', 'content': message}]
 
 
+# GFM's tagfilter: the opening "<" of these tags is escaped even in raw
+# HTML, so a message can't inject a script or swallow the rest of the page
+_GFM_FILTERED_TAG = re.compile(
+    r'<(?=/?(?:title|textarea|style|xmp|iframe|noembed|noframes|script|plaintext)[\s/>])',
+    re.IGNORECASE,
+)
+
+
 def render_markdown(text: str) -> str:
-    """Render markdown to HTML if library available."""
-    if HAS_MARKDOWN:
-        return markdown.markdown(
+    """Render markdown to HTML if library available.
+
+    Raw HTML in the message is passed through, as the markdown package
+    always has, except for the tags GFM's tagfilter escapes; both
+    renderers apply the same rule.
+    """
+    if HAS_CMARKGFM:
+        # GitHub's extensions, minus its <pre lang> code blocks so fences
+        # keep the class="language-*" highlight.js looks for; HARDBREAKS
+        # matches nl2br. UNSAFE keeps raw HTML, which cmark otherwise
+        # replaces with a comment; tagfilter still applies.
+        return cmarkgfm.markdown_to_html_with_extensions(
             text,
-            extensions=['fenced_code', 'tables', 'nl2br']
+            options=CmarkOptions.CMARK_OPT_HARDBREAKS | CmarkOptions.CMARK_OPT_UNSAFE,
+            extensions=['table', 'autolink', 'tagfilter', 'strikethrough', 'tasklist'],
         )
+    if HAS_MARKDOWN:
+        return _GFM_FILTERED_TAG.sub('&lt;', get_markdown_converter().reset().convert(text))
     return f"<pre>{html.escape(text)}</pre>"
 
 
@@ -261,7 +324,12 @@ def render_message_content(message: str, is_assistant: bool = False) -> str:
     if not message:
         return '<span class="text-gray-500">No content</span>'
 
-    segments = parse_message_segments(message)
+    if '</' in message:
+        segments = parse_message_segments(message)
+    else:
+        # Every IDE tag match needs a closing tag; without one, skip the
+        # regex pass (same result as parse_message_segments)
+        segments = [{'type': 'text', 'content': message.strip() or message}]
     parts = []
 
     for seg in segments:
@@ -286,6 +354,8 @@ def render_message_content(message: str, is_assistant: bool = False) -> str:
 def render_index() -> str:
     """Render the session list page."""
     try:
+        # The first user message is looked up only for the sessions that
+        # survive the LIMIT, in the same statement
         sessions = execute_query("""
             WITH session_summary AS (
                 SELECT
@@ -300,6 +370,12 @@ def render_index() -> str:
                 FROM conversation_events
                 WHERE event_session_id IS NOT NULL
                 GROUP BY event_session_id
+            ),
+            recent AS (
+                SELECT *
+                FROM session_summary
+                ORDER BY session_start DESC
+                LIMIT 50
             )
             SELECT
                 event_session_id,
@@ -310,33 +386,25 @@ def render_index() -> str:
                 assistant_messages,
                 event_count,
                 git_remote_url,
-                event_git_branch
-            FROM session_summary
+                event_git_branch,
+                (
+                    SELECT SUBSTR(fm.event_message, 1, 150)
+                    FROM conversation_events fm
+                    WHERE fm.event_session_id = recent.event_session_id
+                        AND fm.event_type = 'user'
+                        AND fm.event_message IS NOT NULL
+                    ORDER BY fm.line_number ASC
+                    LIMIT 1
+                ) as first_msg
+            FROM recent
             ORDER BY session_start DESC
-            LIMIT 50
         """)
     except Exception as e:
-        return html_page("Error", f'<div class="empty-state">Error loading sessions: {html.escape(str(e))}</div>')
+        return error_page("Error", f"Error loading sessions: {html.escape(str(e))}")
 
     if not sessions:
         return html_page("Sessions", '<div class="empty-state">No sessions found.<br>Is vibe-check monitor running?</div>')
 
-    # Get first message for each session
-    first_messages = {}
-    for s in sessions:
-        if s['event_session_id']:
-            msg = execute_query("""
-                SELECT SUBSTR(event_message, 1, 150) as first_msg
-                FROM conversation_events
-                WHERE event_session_id = ?
-                    AND event_type = 'user'
-                    AND event_message IS NOT NULL
-                ORDER BY line_number ASC
-                LIMIT 1
-            """, (s['event_session_id'],))
-            if msg:
-                first_messages[s['event_session_id']] = msg[0]['first_msg']
-
     # Build session cards
     cards = []
     for s in sessions:
@@ -346,7 +414,7 @@ def render_index() -> str:
         branch = s['event_git_branch'] or ''
         duration = s['duration_minutes'] or 0
 
-        first_msg = first_messages.get(session_id, '')
+        first_msg = s['first_msg'] or ''
         if len(first_msg) >= 150:
             first_msg += '...'
 
@@ -373,17 +441,28 @@ def render_index() -> str:
     return html_page("Sessions", content)
 
 
+def prefix_range(prefix: str) -> tuple:
+    """
+    Bounds matching every string that starts with prefix.
+
+    Used as `col >= ? AND col < ?` for short-ID lookups. Unlike LIKE, which
+    is case-insensitive and so can't use the BINARY column indexes, a range
+    is a single index seek.
+    """
+    return prefix, prefix + '\U0010ffff'
+
+
 def resolve_session_id(session_id: str) -> str:
     """Resolve a short session ID to its full form."""
     if len(session_id) == 36:  # Already full UUID
         return session_id
     # Search by prefix
     result = execute_query("""
-        SELECT DISTINCT event_session_id
+        SELECT event_session_id
         FROM conversation_events
-        WHERE event_session_id LIKE ?
+        WHERE event_session_id >= ? AND event_session_id < ?
         LIMIT 1
-    """, (f"{session_id}%",))
+    """, prefix_range(session_id))
     return result[0]['event_session_id'] if result else session_id
 
 
@@ -396,16 +475,16 @@ def resolve_message_uuid(message_uuid: str, session_id: str = None) -> str:
         result = execute_query("""
             SELECT event_uuid
             FROM conversation_events
-            WHERE event_uuid LIKE ? AND event_session_id = ?
+            WHERE event_uuid >= ? AND event_uuid < ? AND event_session_id = ?
             LIMIT 1
-        """, (f"{message_uuid}%", session_id))
+        """, (*prefix_range(message_uuid), session_id))
     else:
         result = execute_query("""
             SELECT event_uuid
             FROM conversation_events
-            WHERE event_uuid LIKE ?
+            WHERE event_uuid >= ? AND event_uuid < ?
             LIMIT 1
-        """, (f"{message_uuid}%",))
+        """, prefix_range(message_uuid))
     return result[0]['event_uuid'] if result else message_uuid
 
 
@@ -436,7 +515,7 @@ def render_session(session_id: str, highlight_msg: str = None) -> str:
         """, (full_session_id,))
 
         if not session_info or not session_info[0]['total_events']:
-            return html_page("Not Found", f'<div class="empty-state">Session {html.escape(session_id[:8])}... not found</div>')
+            return error_page("Not Found", f"Session {html.escape(session_id[:8])}... not found")
 
         info = session_info[0]
         # Use the resolved full session ID for display
@@ -459,7 +538,7 @@ def render_session(session_id: str, highlight_msg: str = None) -> str:
         """, (full_session_id,))
 
     except Exception as e:
-        return html_page("Error", f'<div class="empty-state">Error: {html.escape(str(e))}</div>')
+        return error_page("Error", f"Error: {html.escape(str(e))}")
 
     # Build session header
     repo = info['git_remote_url'].split('/')[-1].replace('.git', '') if info['git_remote_url'] else '(no repo)'
@@ -540,6 +619,55 @@ def render_session(session_id: str, highlight_msg: str = None) -> str:
     return html_page(f"Session {session_id[:8]}", content, include_highlight=True)
 
 
+def encode_page(page: str) -> tuple:
+    """Encode a rendered page as (utf-8, gzip) bytes."""
+    body = page.encode('utf-8')
+    return body, gzip.compress(body, compresslevel=6)
+
+
+# Pages are rendered at most once per database state. db_version (from
+# data_version()) changes whenever the monitor commits, so a cached page
+# is never served once new events have arrived. Error and not-found pages
+# are left out: a locked database may be fine on the next request, and
+# mistyped session IDs shouldn't push real sessions out of the cache.
+
+class _UncachedPage(Exception):
+    """Carries an encoded ErrorPage out of an lru_cache without caching it."""
+
+
+def _encode_cacheable(page: str) -> tuple:
+    """encode_page(), raising _UncachedPage for an ErrorPage."""
+    if isinstance(page, ErrorPage):
+        raise _UncachedPage(encode_page(page))  # lru_cache doesn't store raised calls
+    return encode_page(page)
+
+
+@functools.lru_cache(maxsize=1)
+def _render_index_bytes(db_version: tuple) -> tuple:
+    return _encode_cacheable(render_index())
+
+
+@functools.lru_cache(maxsize=64)
+def _render_session_bytes(session_id: str, highlight_msg: str, db_version: tuple) -> tuple:
+    return _encode_cacheable(render_session(session_id, highlight_msg))
+
+
+def render_index_bytes(db_version: tuple) -> tuple:
+    """Render the session list once per database state, as (utf-8, gzip) bytes."""
+    try:
+        return _render_index_bytes(db_version)
+    except _UncachedPage as e:
+        return e.args[0]
+
+
+def render_session_bytes(session_id: str, highlight_msg: str, db_version: tuple) -> tuple:
+    """Render a session page once per database state, as (utf-8, gzip) bytes."""
+    try:
+        return _render_session_bytes(session_id, highlight_msg, db_version)
+    except _UncachedPage as e:
+        return e.args[0]
+
+
 # =============================================================================
 # HTTP SERVER
 # =============================================================================
@@ -551,13 +679,29 @@ class VibeCheckHandler(BaseHTTPRequestHandler):
         """Custom logging."""
         print(f"[{self.log_date_time_string()}] {args[0]}")
 
+    def accepts_gzip(self) -> bool:
+        """Whether the client accepts gzip-encoded responses."""
+        return 'gzip' in self.headers.get('Accept-Encoding', '')
+
     def send_html(self, content: str, status: int = 200):
-        """Send HTML response."""
+        """Send HTML response, compressed if the client accepts it."""
+        body = content.encode('utf-8')
+        # Uncached pages (errors, no database) are only compressed on demand
+        gzipped = gzip.compress(body, compresslevel=6) if self.accepts_gzip() else body
+        self.send_html_bytes(body, gzipped, status)
+
+    def send_html_bytes(self, body: bytes, gzipped: bytes, status: int = 200):
+        """Send a pre-encoded HTML response, compressed if the client accepts it."""
         self.send_response(status)
+        if self.accepts_gzip():
+            body = gzipped
+            self.send_header('Content-Encoding', 'gzip')
         self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
         self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Vary', 'Accept-Encoding')
         self.end_headers()
-        self.wfile.write(content.encode('utf-8'))
+        self.wfile.write(body)
 
     def do_GET(self):
         """Handle GET requests."""
@@ -566,19 +710,31 @@ class VibeCheckHandler(BaseHTTPRequestHandler):
         query = parse_qs(parsed.query)
 
         try:
-            # Route: /
-            if path == '/' or path == '':
-                self.send_html(render_index())
+            try:
+                db_version = data_version()
+            except Exception:
+                db_version = None  # No usable database; pages render uncached and report it
 
-            # Route: /session/{session_id}
-            elif path.startswith('/session/'):
+            session_id = None
+            if path.startswith('/session/'):
                 session_id = path.split('/session/')[-1].strip('/')
-                if not session_id:
+
+            # Route: /
+            if path == '/' or path == '' or session_id == '':
+                if db_version is None:
                     self.send_html(render_index())
-                    return
+                else:
+                    self.send_html_bytes(*render_index_bytes(db_version))
 
+            # Route: /session/{session_id}
+            elif session_id:
                 highlight_msg = query.get('msg', [None])[0]
-                self.send_html(render_session(session_id, highlight_msg))
+                if db_version is None:
+                    self.send_html(render_session(session_id, highlight_msg))
+                else:
+                    self.send_html_bytes(
+                        *render_session_bytes(session_id, highlight_msg, db_version)
+                    )
 
             # 404 for everything else
             else:
@@ -594,6 +750,37 @@ class VibeCheckHandler(BaseHTTPRequestHandler):
             )
 
 
+class PooledHTTPServer(HTTPServer):
+    """
+    HTTPServer that hands each request to a fixed pool of worker threads.
+
+    Unlike ThreadingHTTPServer, which starts a thread per request, the pool
+    threads live for the whole run, so their per-thread SQLite connections
+    and Markdown converters are reused and their number stays bounded.
+    """
+
+    def __init__(self, server_address, handler_class, max_workers: int = REQUEST_WORKERS):
+        super().__init__(server_address, handler_class)
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='vibe-check-web'
+        )
+
+    def process_request(self, request, client_address):
+        self.executor.submit(self.process_request_thread, request, client_address)
+
+    def process_request_thread(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
 def is_port_in_use(port: int) -> bool:
     """Check if a port is already in use."""
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
@@ -621,7 +808,7 @@ def main():
         print(f"Set VIBE_CHECK_WEB_PORT environment variable to use a different port.")
         return 1
 
-    server = HTTPServer(('127.0.0.1', port), VibeCheckHandler)
+    server = PooledHTTPServer(('127.0.0.1', port), VibeCheckHandler)
     print(f"\nvibe-check web server running at http://localhost:{port}/")
     print("Press Ctrl+C to stop.\n")
 
@@ -629,7 +816,8 @@ def main():
         server.serve_forever()
     except KeyboardInterrupt:
         print("\nShutting down...")
-        server.shutdown()
+    finally:
+        server.server_close()
 
     return 0
 
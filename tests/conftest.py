@@ -0,0 +1,80 @@
+"""
+Shared fixtures for the Python tests.
+
+The MCP server and web viewer modules are imported from mcp-server/, and
+test databases are created with the monitor's own schema (vibe-check.py),
+so both sides are exercised against the real generated columns, FTS index
+and rollups.
+"""
+
+import importlib.util
+import json
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "mcp-server"))
+sys.path.insert(0, str(REPO_ROOT))
+
+
+def _load_monitor():
+    spec = importlib.util.spec_from_file_location("vibe_check_monitor", REPO_ROOT / "vibe-check.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def monitor():
+    """The vibe-check.py module."""
+    return _load_monitor()
+
+
+@pytest.fixture
+def vibe_db(tmp_path, monkeypatch, monitor):
+    """
+    An empty vibe-check database the read-side modules point at.
+
+    Returns the monitor's SQLiteManager; use add_event() below to insert
+    rows. Connections and memoized state in database.py and server.py are
+    reset so every test starts clean.
+    """
+    import database
+    import server
+
+    db_path = tmp_path / "vibe_check.db"
+    manager = monitor.SQLiteManager({"database_path": str(db_path), "user_name": "tester"})
+
+    monkeypatch.setenv("VIBE_CHECK_DB", str(db_path))
+    monkeypatch.setattr(database, "_db_path", None)
+    monkeypatch.setattr(database, "_tls", threading.local())
+    monkeypatch.setattr(database, "_version_conn", None)
+    server._forget_fts_table()
+
+    yield manager
+    manager.close()
+
+
+def add_event(manager, file_name: str, line_number: int, event: dict) -> None:
+    """Insert one raw event, committing so readers see a new data_version."""
+    manager.cursor.execute(
+        "INSERT INTO conversation_events (file_name, line_number, event_data, user_name)"
+        " VALUES (?, ?, ?, ?)",
+        (file_name, line_number, json.dumps(event), "tester"),
+    )
+    manager.connection.commit()
+
+
+def user_event(session_id: str, uuid: str, timestamp: str, text: str) -> dict:
+    """A minimal user message event as Claude Code writes it."""
+    return {
+        "type": "user",
+        "sessionId": session_id,
+        "uuid": uuid,
+        "timestamp": timestamp,
+        "cwd": "/work/project",
+        "message": {"role": "user", "content": text},
+    }
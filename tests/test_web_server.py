@@ -0,0 +1,78 @@
+"""Tests for the web viewer (mcp-server/web_server.py)."""
+
+import gzip
+import sqlite3
+
+import pytest
+
+import web_server
+from conftest import add_event, user_event
+from database import data_version
+
+SESSION_ID = "00000001-aaaa-bbbb-cccc-dddddddddddd"
+
+
+@pytest.fixture(autouse=True)
+def empty_page_caches():
+    web_server._render_index_bytes.cache_clear()
+    web_server._render_session_bytes.cache_clear()
+    yield
+    web_server._render_index_bytes.cache_clear()
+    web_server._render_session_bytes.cache_clear()
+
+
+def _page_text(rendered: tuple) -> str:
+    body, gzipped = rendered
+    assert gzip.decompress(gzipped) == body
+    return body.decode("utf-8")
+
+
+def test_error_pages_are_not_cached(vibe_db, monkeypatch):
+    add_event(
+        vibe_db,
+        "s.jsonl",
+        1,
+        user_event(SESSION_ID, "u1", "2026-01-01T00:00:00.000Z", "deploy finished"),
+    )
+    real_execute_query = web_server.execute_query
+    locked = True
+
+    def execute_query(*args, **kwargs):
+        if locked:
+            raise sqlite3.OperationalError("database is locked")
+        return real_execute_query(*args, **kwargs)
+
+    monkeypatch.setattr(web_server, "execute_query", execute_query)
+    db_version = data_version()
+
+    first = _page_text(web_server.render_index_bytes(db_version))
+    locked = False
+    second = _page_text(web_server.render_index_bytes(db_version))
+
+    assert "database is locked" in first
+    assert "deploy finished" in second
+
+
+def test_not_found_sessions_are_not_cached(vibe_db):
+    db_version = data_version()
+
+    page = _page_text(web_server.render_session_bytes("deadbeef", None, db_version))
+
+    assert "not found" in page
+    assert web_server._render_session_bytes.cache_info().currsize == 0
+
+
+def test_session_pages_are_cached(vibe_db):
+    add_event(
+        vibe_db,
+        "s.jsonl",
+        1,
+        user_event(SESSION_ID, "u1", "2026-01-01T00:00:00.000Z", "deploy finished"),
+    )
+    db_version = data_version()
+
+    first = web_server.render_session_bytes(SESSION_ID, None, db_version)
+    second = web_server.render_session_bytes(SESSION_ID, None, db_version)
+
+    assert "deploy finished" in _page_text(first)
+    assert second is first
@@ -30,6 +30,12 @@ from watchdog.events import FileSystemEventHandler, FileModifiedEvent
 
 from secret_detector import redact_if_secret
 
+# Use orjson for the per-line JSONL parse/serialize when available
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging with timestamp format
 LOG_FORMAT = "%(asctime)s %(levelname)s %(message)s"
 LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
@@ -47,6 +53,14 @@ VERSION = "1.2.13"
 # Default production API URL
 DEFAULT_API_URL = "https://vibecheck.wanderingstan.com/api"
 
+# FTS5 tokenizer for messages_fts. trigram indexes every 3-character
+# substring, so identifier fragments, hyphenated terms and CJK text match;
+# it needs SQLite 3.34+, older builds keep the default unicode61.
+FTS_TOKENIZER = "trigram" if sqlite3.sqlite_version_info >= (3, 34, 0) else "unicode61"
+
+# Rows sampled per index when PRAGMA optimize runs ANALYZE
+ANALYSIS_LIMIT = 400
+
 
 def setup_logging(log_file: Optional[Path] = None, verbose: bool = False):
     """Configure logging with optional file output."""
@@ -73,6 +87,58 @@ def setup_logging(log_file: Optional[Path] = None, verbose: bool = False):
         logger.addHandler(console_handler)
 
 
+def json_loads_event(line: bytes):
+    """Parse one JSONL record, using orjson when it is installed.
+
+    orjson is stricter than the stdlib parser (lone surrogate escapes, NaN,
+    out-of-range floats); such lines are retried with json.loads.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(line)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(line)
+
+
+def json_dumps_event(event_data: dict) -> str:
+    """Serialize an event for storage, using orjson when it is installed.
+
+    orjson refuses integers beyond 64 bits; those events go through the
+    stdlib encoder instead.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(event_data).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(event_data)
+
+
+def iter_jsonl_files(directory: Path):
+    """Yield (relative name, os.DirEntry) for every .jsonl file under directory.
+
+    A stack-based os.scandir walk. The directory listing's file type answers
+    is_dir()/is_file() without a syscall on most filesystems; entry.stat()
+    still costs one stat call per file on POSIX (cached on the entry after
+    that). The name relative to directory is built along the way instead of
+    being derived per file. Symlinked directories are not descended into,
+    like Path.rglob().
+    """
+    stack = [(str(directory), "")]
+    while stack:
+        path, prefix = stack.pop()
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, f"{prefix}{entry.name}{os.sep}"))
+                    elif entry.name.endswith(".jsonl") and entry.is_file():
+                        yield prefix + entry.name, entry
+        except OSError as e:
+            logger.warning(f"Could not scan {path}: {e}")
+
+
 def get_git_info(directory: Path) -> Tuple[Optional[str], Optional[str]]:
     """
     Get git remote URL and commit hash from a directory.
@@ -139,10 +205,20 @@ class StateManager:
             CREATE TABLE IF NOT EXISTS conversation_file_state (
                 file_name TEXT PRIMARY KEY,
                 last_line INTEGER NOT NULL DEFAULT 0,
-                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                last_offset INTEGER,
+                offset_line INTEGER
             )
         """
         )
+        # Byte offsets were added later; older tables only track line counts
+        self.cursor.execute("PRAGMA table_info(conversation_file_state)")
+        columns = [row[1] for row in self.cursor.fetchall()]
+        for column in ("last_offset", "offset_line"):
+            if column not in columns:
+                self.cursor.execute(
+                    f"ALTER TABLE conversation_file_state ADD COLUMN {column} INTEGER"
+                )
         self.connection.commit()
         # Log count of tracked files
         self.cursor.execute("SELECT COUNT(*) FROM conversation_file_state")
@@ -199,18 +275,57 @@ class StateManager:
             row = self.cursor.fetchone()
             return row[0] if row else 0
 
-    def set_last_line(self, filename: str, line_number: int):
-        """Set the last processed line number for a file."""
+    def get_position(self, filename: str) -> Tuple[int, Optional[int]]:
+        """Get the last processed line number and its byte offset for a file.
+
+        The offset is None when it is unknown or was recorded for a different
+        line count (e.g. `rescan` or a legacy migration moved last_line on its
+        own); callers then have to skip last_line lines to find the position.
+        """
+        with self._lock:
+            self.cursor.execute(
+                """
+                SELECT last_line, last_offset, offset_line
+                FROM conversation_file_state WHERE file_name = ?
+            """,
+                (filename,),
+            )
+            row = self.cursor.fetchone()
+            if not row:
+                return 0, 0
+            last_line, last_offset, offset_line = row
+            return last_line, last_offset if offset_line == last_line else None
+
+    def get_offsets(self) -> dict:
+        """Map every tracked file to its byte offset (None when unknown)."""
         with self._lock:
             self.cursor.execute(
                 """
-                INSERT INTO conversation_file_state (file_name, last_line, updated_at)
-                VALUES (?, ?, CURRENT_TIMESTAMP)
+                SELECT file_name,
+                       CASE WHEN offset_line = last_line THEN last_offset END
+                FROM conversation_file_state
+            """
+            )
+            return dict(self.cursor.fetchall())
+
+    def set_last_line(
+        self, filename: str, line_number: int, offset: Optional[int] = None
+    ):
+        """Set the last processed line number (and its byte offset) for a file."""
+        offset_line = line_number if offset is not None else None
+        with self._lock:
+            self.cursor.execute(
+                """
+                INSERT INTO conversation_file_state
+                    (file_name, last_line, last_offset, offset_line, updated_at)
+                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
                 ON CONFLICT(file_name) DO UPDATE SET
                     last_line = excluded.last_line,
+                    last_offset = excluded.last_offset,
+                    offset_line = excluded.offset_line,
                     updated_at = CURRENT_TIMESTAMP
             """,
-                (filename, line_number),
+                (filename, line_number, offset, offset_line),
             )
             self.connection.commit()
 
@@ -235,13 +350,18 @@ class StateManager:
             if debug_filter_project and not filename.startswith(debug_filter_project):
                 continue
 
-            # Count lines in file
+            # Count lines in file, ending at its byte offset
             try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    line_count = sum(1 for _ in f)
+                line_count = offset = 0
+                with open(file_path, "rb") as f:
+                    for line in f:
+                        if not line.endswith(b"\n"):
+                            break  # Still being written; picked up later
+                        line_count += 1
+                        offset += len(line)
 
                 if line_count > 0:
-                    updates.append((filename, line_count))
+                    updates.append((filename, line_count, offset, line_count))
                     logger.debug(f"Skipped {line_count} lines in {filename}")
                     count += 1
             except Exception as e:
@@ -252,10 +372,13 @@ class StateManager:
             with self._lock:
                 self.cursor.executemany(
                     """
-                    INSERT INTO conversation_file_state (file_name, last_line, updated_at)
-                    VALUES (?, ?, CURRENT_TIMESTAMP)
+                    INSERT INTO conversation_file_state
+                        (file_name, last_line, last_offset, offset_line, updated_at)
+                    VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
                     ON CONFLICT(file_name) DO UPDATE SET
                         last_line = excluded.last_line,
+                        last_offset = excluded.last_offset,
+                        offset_line = excluded.offset_line,
                         updated_at = CURRENT_TIMESTAMP
                 """,
                     updates,
@@ -307,6 +430,7 @@ class SQLiteManager:
             self.connect()
             self.create_schema()
             self._migrate_schema()
+            self.optimize(analyze_all=True)
             self.export_schema_docs()
             logger.info(f"Connected to SQLite database: {self.db_path}")
         except Exception as e:
@@ -445,19 +569,44 @@ class SQLiteManager:
                 CREATE INDEX IF NOT EXISTS idx_synced_at ON conversation_events(synced_at)
             """
             )
-
-            # Create FTS5 virtual table for full-text search
+            # Indexes for the MCP server / web viewer read queries, which
+            # filter on date ranges and group or look up by session
             self.cursor.execute(
                 """
-                CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
-                    event_message,
-                    event_type,
-                    event_session_id,
-                    content=conversation_events,
-                    content_rowid=id
-                )
+                CREATE INDEX IF NOT EXISTS idx_event_timestamp ON conversation_events(event_timestamp)
+            """
+            )
+            self.cursor.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_session_timestamp
+                ON conversation_events(event_session_id, event_timestamp)
+            """
+            )
+            # Readers filter on DATE(event_timestamp), which a plain
+            # event_timestamp index can't serve; index the expression itself
+            self.cursor.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_event_date_session
+                ON conversation_events(DATE(event_timestamp), event_session_id, event_type)
             """
             )
+            # A session's first user message (ordered by line) is one seek
+            self.cursor.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_session_type_line
+                ON conversation_events(event_session_id, event_type, line_number)
+            """
+            )
+            # The web viewer reads a whole session in line order
+            self.cursor.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_session_line
+                ON conversation_events(event_session_id, line_number)
+            """
+            )
+
+            # Create FTS5 virtual table for full-text search
+            self._create_fts_table()
 
             # Create triggers to keep FTS5 in sync with conversation_events
             self.cursor.execute(
@@ -497,13 +646,18 @@ class SQLiteManager:
             """
             )
 
+            self._create_daily_rollups()
+            self._create_tool_uses_table()
+
             # Create conversation_file_state table for tracking processed lines
             self.cursor.execute(
                 """
                 CREATE TABLE IF NOT EXISTS conversation_file_state (
                     file_name TEXT PRIMARY KEY,
                     last_line INTEGER NOT NULL DEFAULT 0,
-                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    last_offset INTEGER,
+                    offset_line INTEGER
                 )
             """
             )
@@ -618,7 +772,11 @@ class SQLiteManager:
             output += "**Features:**\n"
             output += "- 10-100x faster than LIKE '%text%' queries\n"
             output += "- BM25 relevance ranking (lower rank = more relevant)\n"
-            output += "- Automatically synced with conversation_events via triggers\n\n"
+            output += "- Automatically synced with conversation_events via triggers\n"
+            output += f"- `{FTS_TOKENIZER}` tokenizer"
+            if FTS_TOKENIZER == "trigram":
+                output += " (terms match as substrings and need at least 3 characters)"
+            output += "\n\n"
             output += "**Query Syntax:**\n"
             output += "- Simple: `authentication`\n"
             output += "- Phrase: `\"user login\"`\n"
@@ -633,6 +791,15 @@ class SQLiteManager:
             output += "ORDER BY fts.rank\n"
             output += "LIMIT 10;\n"
             output += "```\n\n"
+            output += "### Daily Rollups (daily_stats, daily_sessions)\n\n"
+            output += "Pre-aggregated counts maintained by triggers on conversation_events:\n\n"
+            output += "- `daily_stats` - event count per (date, git_remote_url, event_type)\n"
+            output += "- `daily_sessions` - distinct sessions per (date, git_remote_url)\n"
+            output += "- NULL dates, repos and event types are stored as `''`\n\n"
+            output += "### Tool Uses (tool_uses)\n\n"
+            output += "One row per `tool_use` block in assistant messages, maintained by triggers:\n\n"
+            output += "- `tool_name`, `event_session_id`, `event_date` (DATE of the event), `git_remote_url`\n"
+            output += "- `event_id` references conversation_events.id\n\n"
             output += "### Database Configuration\n\n"
             output += "- Uses WAL mode for concurrent access\n"
             output += "- event_message extracts text from various JSON structures automatically\n"
@@ -708,11 +875,12 @@ class SQLiteManager:
             # Check if FTS5 table exists and needs population
             self.cursor.execute(
                 """
-                SELECT name FROM sqlite_master
+                SELECT sql FROM sqlite_master
                 WHERE type='table' AND name='messages_fts'
             """
             )
-            fts_exists = self.cursor.fetchone() is not None
+            fts_row = self.cursor.fetchone()
+            fts_exists = fts_row is not None
 
             if not fts_exists:
                 logger.info("Migrating schema: creating FTS5 full-text search index...")
@@ -720,6 +888,12 @@ class SQLiteManager:
                 # Just need to populate it with existing data
                 self._populate_fts_table()
                 logger.info("Schema migration complete: FTS5 index created and populated")
+            elif f"tokenize='{FTS_TOKENIZER}'" not in fts_row[0]:
+                logger.info(
+                    f"Migrating schema: rebuilding FTS5 index with the {FTS_TOKENIZER} tokenizer..."
+                )
+                self._rebuild_fts_table()
+                logger.info("Schema migration complete: FTS5 index rebuilt")
             else:
                 # Check if FTS5 table needs population (empty but main table has data)
                 self.cursor.execute("SELECT COUNT(*) FROM messages_fts")
@@ -736,6 +910,28 @@ class SQLiteManager:
                     self._populate_fts_table()
                     logger.info("FTS5 table populated successfully")
 
+            # Backfill the daily rollups for databases that predate them
+            self.cursor.execute("SELECT EXISTS (SELECT 1 FROM daily_stats)")
+            rollup_populated = self.cursor.fetchone()[0]
+            self.cursor.execute("SELECT EXISTS (SELECT 1 FROM conversation_events)")
+            has_events = self.cursor.fetchone()[0]
+            if has_events and not rollup_populated:
+                logger.info("Migrating schema: building daily rollup tables...")
+                self._populate_daily_rollups()
+                logger.info("Schema migration complete: daily rollups populated")
+
+            # Backfill tool_uses for databases that predate it
+            self.cursor.execute("SELECT EXISTS (SELECT 1 FROM tool_uses)")
+            tool_uses_populated = self.cursor.fetchone()[0]
+            self.cursor.execute(
+                "SELECT EXISTS (SELECT 1 FROM conversation_events WHERE event_type = 'assistant')"
+            )
+            has_assistant_events = self.cursor.fetchone()[0]
+            if has_assistant_events and not tool_uses_populated:
+                logger.info("Migrating schema: extracting tool uses...")
+                self._populate_tool_uses()
+                logger.info("Schema migration complete: tool_uses populated")
+
     def _recreate_table_with_new_schema(self):
         """Recreate conversation_events table to add new generated columns.
 
@@ -868,6 +1064,23 @@ class SQLiteManager:
         self.cursor.execute(
             "CREATE INDEX IF NOT EXISTS idx_event_model ON conversation_events(event_model)"
         )
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_session_timestamp ON conversation_events(event_session_id, event_timestamp)"
+        )
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_event_date_session ON conversation_events(DATE(event_timestamp), event_session_id, event_type)"
+        )
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_session_type_line ON conversation_events(event_session_id, event_type, line_number)"
+        )
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_session_line ON conversation_events(event_session_id, line_number)"
+        )
+
+        # Rollup triggers were dropped along with the old table; the rollup
+        # tables themselves still match the copied rows
+        self._create_daily_rollups()
+        self._create_tool_uses_table()
 
         # Recreate dependent views
         for view_name, view_sql in views:
@@ -969,6 +1182,251 @@ class SQLiteManager:
             logger.error(f"SQLite batch insert error: {e}")
             return 0
 
+    def _create_daily_rollups(self):
+        """Create the daily rollup tables and the triggers that maintain them.
+
+        daily_stats holds event counts per (date, repo, event_type) and
+        daily_sessions the distinct sessions per (date, repo), so usage
+        statistics never need to scan conversation_events. NULL keys are
+        stored as '' so they collapse into a single primary key.
+        """
+        self.cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS daily_stats (
+                date TEXT NOT NULL,
+                git_remote_url TEXT NOT NULL,
+                event_type TEXT NOT NULL,
+                events INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (date, git_remote_url, event_type)
+            ) WITHOUT ROWID
+        """
+        )
+        self.cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS daily_sessions (
+                date TEXT NOT NULL,
+                git_remote_url TEXT NOT NULL,
+                event_session_id TEXT NOT NULL,
+                PRIMARY KEY (date, git_remote_url, event_session_id)
+            ) WITHOUT ROWID
+        """
+        )
+
+        self.cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS daily_rollup_insert
+            AFTER INSERT ON conversation_events
+            BEGIN
+                INSERT INTO daily_stats(date, git_remote_url, event_type, events)
+                VALUES (
+                    IFNULL(DATE(new.event_timestamp), ''),
+                    IFNULL(new.git_remote_url, ''),
+                    IFNULL(new.event_type, ''),
+                    1
+                )
+                ON CONFLICT(date, git_remote_url, event_type)
+                DO UPDATE SET events = events + 1;
+
+                INSERT OR IGNORE INTO daily_sessions(date, git_remote_url, event_session_id)
+                SELECT
+                    IFNULL(DATE(new.event_timestamp), ''),
+                    IFNULL(new.git_remote_url, ''),
+                    new.event_session_id
+                WHERE new.event_session_id IS NOT NULL;
+            END
+        """
+        )
+
+        # Only synced_at is ever updated in place, so no UPDATE trigger
+        self.cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS daily_rollup_delete
+            AFTER DELETE ON conversation_events
+            BEGIN
+                UPDATE daily_stats SET events = events - 1
+                WHERE date = IFNULL(DATE(old.event_timestamp), '')
+                    AND git_remote_url = IFNULL(old.git_remote_url, '')
+                    AND event_type = IFNULL(old.event_type, '');
+
+                DELETE FROM daily_stats
+                WHERE date = IFNULL(DATE(old.event_timestamp), '')
+                    AND git_remote_url = IFNULL(old.git_remote_url, '')
+                    AND event_type = IFNULL(old.event_type, '')
+                    AND events <= 0;
+
+                DELETE FROM daily_sessions
+                WHERE date = IFNULL(DATE(old.event_timestamp), '')
+                    AND git_remote_url = IFNULL(old.git_remote_url, '')
+                    AND event_session_id = old.event_session_id
+                    AND NOT EXISTS (
+                        SELECT 1 FROM conversation_events
+                        WHERE event_session_id = old.event_session_id
+                            AND IFNULL(DATE(event_timestamp), '') = IFNULL(DATE(old.event_timestamp), '')
+                            AND IFNULL(git_remote_url, '') = IFNULL(old.git_remote_url, '')
+                    );
+            END
+        """
+        )
+
+    def _populate_daily_rollups(self):
+        """Rebuild the daily rollup tables from conversation_events.
+
+        Called during migration when the rollup tables are first created
+        on a database that already has events.
+        """
+        try:
+            self.cursor.execute("DELETE FROM daily_stats")
+            self.cursor.execute("DELETE FROM daily_sessions")
+            self.cursor.execute(
+                """
+                INSERT INTO daily_stats(date, git_remote_url, event_type, events)
+                SELECT
+                    IFNULL(DATE(event_timestamp), ''),
+                    IFNULL(git_remote_url, ''),
+                    IFNULL(event_type, ''),
+                    COUNT(*)
+                FROM conversation_events
+                GROUP BY 1, 2, 3
+            """
+            )
+            self.cursor.execute(
+                """
+                INSERT OR IGNORE INTO daily_sessions(date, git_remote_url, event_session_id)
+                SELECT DISTINCT
+                    IFNULL(DATE(event_timestamp), ''),
+                    IFNULL(git_remote_url, ''),
+                    event_session_id
+                FROM conversation_events
+                WHERE event_session_id IS NOT NULL
+            """
+            )
+            self.connection.commit()
+
+        except sqlite3.Error as e:
+            self.connection.rollback()
+            logger.error(f"Error populating daily rollup tables: {e}")
+            # Don't raise - the MCP server falls back to scanning conversation_events
+
+    def _create_tool_uses_table(self):
+        """Create the tool_uses table and the triggers that maintain it.
+
+        One row per tool_use block in an assistant message, extracted from
+        event_data once at insert time so tool analysis doesn't re-parse
+        the JSON of every event on each query.
+        """
+        self.cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS tool_uses (
+                event_id INTEGER NOT NULL,
+                content_index INTEGER NOT NULL,
+                event_session_id TEXT,
+                event_date TEXT,
+                git_remote_url TEXT,
+                tool_name TEXT NOT NULL,
+                PRIMARY KEY (event_id, content_index)
+            ) WITHOUT ROWID
+        """
+        )
+        self.cursor.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_tool_uses_date
+            ON tool_uses(event_date, tool_name, event_session_id)
+        """
+        )
+
+        self.cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS tool_uses_insert
+            AFTER INSERT ON conversation_events
+            WHEN new.event_type = 'assistant'
+                AND json_type(new.event_data, '$.message.content') = 'array'
+            BEGIN
+                INSERT OR IGNORE INTO tool_uses(
+                    event_id, content_index, event_session_id, event_date,
+                    git_remote_url, tool_name
+                )
+                SELECT
+                    new.id, key, new.event_session_id, DATE(new.event_timestamp),
+                    new.git_remote_url, json_extract(value, '$.name')
+                FROM json_each(new.event_data, '$.message.content')
+                WHERE json_extract(value, '$.type') = 'tool_use'
+                    AND json_extract(value, '$.name') IS NOT NULL;
+            END
+        """
+        )
+
+        self.cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS tool_uses_delete
+            AFTER DELETE ON conversation_events
+            BEGIN
+                DELETE FROM tool_uses WHERE event_id = old.id;
+            END
+        """
+        )
+
+    def _populate_tool_uses(self):
+        """Rebuild tool_uses from the assistant events in conversation_events.
+
+        Called during migration when the table is first created on a
+        database that already has events.
+        """
+        try:
+            self.cursor.execute("DELETE FROM tool_uses")
+            self.cursor.execute(
+                """
+                INSERT OR IGNORE INTO tool_uses(
+                    event_id, content_index, event_session_id, event_date,
+                    git_remote_url, tool_name
+                )
+                SELECT
+                    ce.id, je.key, ce.event_session_id, DATE(ce.event_timestamp),
+                    ce.git_remote_url, json_extract(je.value, '$.name')
+                FROM conversation_events ce,
+                     json_each(ce.event_data, '$.message.content') je
+                WHERE ce.event_type = 'assistant'
+                    AND json_type(ce.event_data, '$.message.content') = 'array'
+                    AND json_extract(je.value, '$.type') = 'tool_use'
+                    AND json_extract(je.value, '$.name') IS NOT NULL
+            """
+            )
+            self.connection.commit()
+
+        except sqlite3.Error as e:
+            self.connection.rollback()
+            logger.error(f"Error populating tool_uses table: {e}")
+            # Don't raise - the MCP server falls back to parsing event_data
+
+    def _create_fts_table(self):
+        """Create the messages_fts table with the configured tokenizer."""
+        self.cursor.execute(
+            f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+                event_message,
+                event_type,
+                event_session_id,
+                content=conversation_events,
+                content_rowid=id,
+                tokenize='{FTS_TOKENIZER}'
+            )
+        """
+        )
+
+    def _rebuild_fts_table(self):
+        """Recreate messages_fts with the configured tokenizer and reindex.
+
+        The sync triggers refer to messages_fts by name, so they keep
+        working against the new table.
+        """
+        try:
+            self.cursor.execute("DROP TABLE IF EXISTS messages_fts")
+            self._create_fts_table()
+            self.connection.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Error recreating FTS5 table: {e}")
+            return
+        self._populate_fts_table()
+
     def _populate_fts_table(self):
         """Populate FTS5 table with existing data from conversation_events.
 
@@ -1262,13 +1720,36 @@ class SQLiteManager:
         except sqlite3.Error as e:
             logger.error(f"SQLite error marking scope synced: {e}")
 
+    def optimize(self, analyze_all: bool = False):
+        """Refresh query planner statistics via PRAGMA optimize.
+
+        With analyze_all, every table is checked (used at startup so indexes
+        added by create_schema get statistics); otherwise only tables this
+        connection has queried are considered.
+        """
+        if not self.enabled or not self.cursor:
+            return
+        try:
+            with self._lock:
+                # Bound each ANALYZE to a sample, as SQLite recommends for
+                # optimize; older builds otherwise scan every index in full
+                self.cursor.execute(f"PRAGMA analysis_limit={ANALYSIS_LIMIT}")
+                self.cursor.execute(
+                    "PRAGMA optimize=0x10002" if analyze_all else "PRAGMA optimize"
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"PRAGMA optimize failed: {e}")
+
     def close(self):
         """Close SQLite connection."""
+        self.optimize()
         with self._lock:
             if self.cursor:
                 self.cursor.close()
+                self.cursor = None
             if self.connection:
                 self.connection.close()
+                self.connection = None
 
     def __del__(self):
         """Cleanup on deletion."""
@@ -1281,6 +1762,12 @@ class SQLiteManager:
 class ConversationMonitor(FileSystemEventHandler):
     """Handles file system events for conversation files."""
 
+    # Quiet period after the last modification before a file is read, so a
+    # burst of appended lines is picked up in one pass. A file that never
+    # goes quiet is still read once this long after its first pending event.
+    MODIFIED_DEBOUNCE_SECONDS = 0.2
+    MODIFIED_MAX_DELAY_SECONDS = 2.0
+
     def __init__(
         self,
         api_config: dict,
@@ -1319,6 +1806,14 @@ class ConversationMonitor(FileSystemEventHandler):
         self.sync_backoff_delay = 0.1  # Start at 100ms between requests
         self.last_sync_attempt = None  # Timestamp of last sync attempt for health monitoring
 
+        # Debounced on_modified processing: one pending timer per file with
+        # its [first, last] event times, and a lock so timer and observer
+        # threads never process files concurrently
+        self._pending_timers: dict = {}
+        self._pending_times: dict = {}
+        self._pending_lock = threading.Lock()
+        self._process_lock = threading.Lock()
+
         # Log configuration summary
         destinations = []
         if self.api_enabled:
@@ -1379,71 +1874,85 @@ class ConversationMonitor(FileSystemEventHandler):
             if not filename.startswith(self.debug_filter_project):
                 return
 
-        last_line = self.state_manager.get_last_line(filename)
+        last_line, offset = self.state_manager.get_position(filename)
 
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                lines = f.readlines()
-
-            # Process only new lines
-            new_lines = lines[last_line:]
-            if not new_lines:
-                # Still track empty/fully-processed files so they count as "complete"
-                if last_line == 0 and len(lines) == 0:
-                    self.state_manager.set_last_line(filename, 0)
-                return
-
-            logger.info(f"Processing {len(new_lines)} new line(s) from {filename}")
-
-            # Track counts and collect events for batch insert
-            skipped_count = 0
-            events_batch = []
-            final_line_number = last_line
+            with open(file_path, "rb") as f:
+                # Resume from the stored byte offset so only the new tail is
+                # read. Without one (older state, skip_to_end, rescan), skip
+                # the processed lines once; the offset is saved from here on.
+                if offset is not None:
+                    f.seek(offset)
+                else:
+                    for _ in range(last_line):
+                        if not f.readline().endswith(b"\n"):
+                            return  # File is shorter than what was processed
+                end_offset = f.tell()
+
+                # Track counts and collect events for batch insert
+                skipped_count = 0
+                events_batch = []
+                final_line_number = last_line
+
+                # Git info fetched lazily from first event's cwd
+                # (file_path.parent is ~/.claude/projects/... which is not a git repo)
+                git_remote_url = None
+                git_commit_hash = None
+                git_info_fetched = False
+
+                for line in f:
+                    # The writer may still be appending the last line; leave
+                    # it for the next pass so offsets stay on line boundaries
+                    if not line.endswith(b"\n"):
+                        break
+                    end_offset += len(line)
+                    final_line_number += 1
+                    line = line.strip()
+
+                    if not line:
+                        skipped_count += 1
+                        continue
 
-            # Git info fetched lazily from first event's cwd
-            # (file_path.parent is ~/.claude/projects/... which is not a git repo)
-            git_remote_url = None
-            git_commit_hash = None
-            git_info_fetched = False
+                    try:
+                        # Parse JSON
+                        event_data = json_loads_event(line)
+
+                        # Get git info once from the first event's working directory
+                        if not git_info_fetched:
+                            working_dir = event_data.get("cwd")
+                            if working_dir:
+                                git_remote_url, git_commit_hash = get_git_info(Path(working_dir))
+                                git_info_fetched = True
+
+                        # Redact secrets before storage
+                        event_data = self.redact_secrets_from_event(event_data)
+                        event_json = json_dumps_event(event_data)
+
+                        # Collect for batch insert
+                        events_batch.append(
+                            (
+                                filename,
+                                final_line_number,
+                                event_json,
+                                git_remote_url,
+                                git_commit_hash,
+                            )
+                        )
 
-            for idx, line in enumerate(new_lines):
-                line_number = last_line + idx + 1
-                final_line_number = line_number
-                line = line.strip()
+                    except json.JSONDecodeError as e:
+                        logger.warning(f"Invalid JSON at {filename}:{final_line_number}: {e}")
+                        skipped_count += 1
 
-                if not line:
-                    skipped_count += 1
-                    continue
-
-                try:
-                    # Parse JSON
-                    event_data = json.loads(line)
-
-                    # Get git info once from the first event's working directory
-                    if not git_info_fetched:
-                        working_dir = event_data.get("cwd")
-                        if working_dir:
-                            git_remote_url, git_commit_hash = get_git_info(Path(working_dir))
-                            git_info_fetched = True
-
-                    # Redact secrets before storage
-                    event_data = self.redact_secrets_from_event(event_data)
-                    event_json = json.dumps(event_data)
-
-                    # Collect for batch insert
-                    events_batch.append(
-                        (
-                            filename,
-                            line_number,
-                            event_json,
-                            git_remote_url,
-                            git_commit_hash,
-                        )
-                    )
+            if final_line_number == last_line:
+                # Still track empty/fully-processed files so they count as
+                # "complete", and keep the offset found by skipping lines
+                if (last_line == 0 and end_offset == 0) or offset is None:
+                    self.state_manager.set_last_line(filename, last_line, end_offset)
+                return
 
-                except json.JSONDecodeError as e:
-                    logger.warning(f"Invalid JSON at {filename}:{line_number}: {e}")
-                    skipped_count += 1
+            logger.info(
+                f"Processing {final_line_number - last_line} new line(s) from {filename}"
+            )
 
             # Batch insert all events (single commit)
             stored_count = 0
@@ -1451,7 +1960,7 @@ class ConversationMonitor(FileSystemEventHandler):
                 stored_count = self.sqlite_manager.insert_events_batch(events_batch)
 
             # Update state once at the end (single commit)
-            self.state_manager.set_last_line(filename, final_line_number)
+            self.state_manager.set_last_line(filename, final_line_number, end_offset)
 
             # Log summary
             if stored_count > 0:
@@ -1564,7 +2073,7 @@ class ConversationMonitor(FileSystemEventHandler):
         file_path = Path(event.src_path)
         if file_path.suffix == ".jsonl":
             logger.info(f"Detected change: {file_path.name}")
-            self.process_file(file_path)
+            self._schedule_process(file_path)
 
     def on_created(self, event):
         """Handle file creation events."""
@@ -1574,8 +2083,58 @@ class ConversationMonitor(FileSystemEventHandler):
         file_path = Path(event.src_path)
         if file_path.suffix == ".jsonl":
             logger.info(f"Detected new file: {file_path.name}")
+            with self._process_lock:
+                self.process_file(file_path)
+
+    def _schedule_process(self, file_path: Path):
+        """Note a modification, arming the debounce timer if none is pending."""
+        now = time.monotonic()
+        with self._pending_lock:
+            times = self._pending_times.get(file_path)
+            if times:
+                times[1] = now  # The pending timer re-arms itself as needed
+                return
+            self._pending_times[file_path] = [now, now]
+            self._start_pending_timer(file_path, self.MODIFIED_DEBOUNCE_SECONDS)
+
+    def _start_pending_timer(self, file_path: Path, delay: float):
+        """Start the timer for a pending file. Caller holds _pending_lock."""
+        timer = threading.Timer(delay, self._process_pending, args=(file_path,))
+        timer.daemon = True
+        self._pending_timers[file_path] = timer
+        timer.start()
+
+    def _process_pending(self, file_path: Path):
+        """Timer callback: process a file once it settles or waited too long."""
+        with self._pending_lock:
+            # flush_pending may already have taken this file
+            if self._pending_timers.get(file_path) is not threading.current_thread():
+                return
+            first, last = self._pending_times[file_path]
+            due = min(
+                last + self.MODIFIED_DEBOUNCE_SECONDS,
+                first + self.MODIFIED_MAX_DELAY_SECONDS,
+            )
+            remaining = due - time.monotonic()
+            if remaining > 0:
+                self._start_pending_timer(file_path, remaining)
+                return
+            del self._pending_timers[file_path]
+            del self._pending_times[file_path]
+        with self._process_lock:
             self.process_file(file_path)
 
+    def flush_pending(self):
+        """Process files that still have a debounce timer pending (on shutdown)."""
+        with self._pending_lock:
+            pending = list(self._pending_timers.items())
+            self._pending_timers.clear()
+            self._pending_times.clear()
+        for file_path, timer in pending:
+            timer.cancel()
+            with self._process_lock:
+                self.process_file(file_path)
+
     # ===== Background Sync Worker =====
 
     def start_sync_worker(self):
@@ -1796,11 +2355,22 @@ class ConversationMonitor(FileSystemEventHandler):
         return synced_count, True  # True = had events to sync
 
     def process_existing_files(self, directory: Path):
-        """Process all existing JSONL files on startup."""
+        """Process all existing JSONL files on startup.
+
+        Files are only opened when they have grown past their stored byte
+        offset; session files are append-only, so an equal size means there
+        is nothing new to read.
+        """
         logger.info("Processing existing files...")
-        for file_path in directory.glob("**/*.jsonl"):
-            self.process_file(file_path)
-        logger.info("Finished processing existing files")
+        offsets = self.state_manager.get_offsets()
+        skipped = 0
+        for filename, entry in iter_jsonl_files(directory):
+            offset = offsets.get(filename)
+            if offset is not None and offset == entry.stat().st_size:
+                skipped += 1
+                continue
+            self.process_file(Path(entry.path))
+        logger.info(f"Finished processing existing files ({skipped} unchanged)")
 
 
 def is_mcp_plugin_installed() -> bool:
@@ -5099,6 +5669,7 @@ def run_monitor(args):
         observer.stop()
 
     observer.join()
+    event_handler.flush_pending()
     logger.info("vibe-check process Monitor stopped")
 
 